@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+============================================================
+PLANIFICADOR ADAPTATIVO DE PROFUNDIDADES — INICIO DE RECURRENCIA
+============================================================
+Proyecto Kaelion — Paper 1
+
+DEPTHS skips 9, 11 and 13, right where the recurrences of N = 12
+and N = 16–20 start, and a uniform grid out to d ~ 200 spends
+most of its points on flat scrambled stretches. The scheduler
+starts from a coarse grid 0, 1, …, s, then every s up to d_max;
+if that costs more than COARSE_SHARE of the step budget, the
+spacing grows with depth as max(s, ρ·d), with the smallest ρ that
+fits (ValueError if even 0…s, d_max does not), and it bisects only
+the intervals where the curve does something:
+
+  crossing   C is below the floor 1/2^N at one end and above it
+             at the other (refined first, down to adjacent depths)
+  jump       |log10 C(b) − log10 C(a)| ≥ JUMP decades
+
+Each round evaluates, as one batch, the midpoints of the selected
+intervals that still fit the step budget; intervals that are flat
+(or below the floor at both ends) are never refined, so structure
+shorter than the local spacing between two coarse points below
+the floor is not seen (the integrable curve, periodic in d,
+aliases with s = 4).
+
+The evaluator is any batch curve function, evaluate(depths) →
+C(d), with cost(d) Floquet steps per point. The default runs
+otoc_engine.echo on one FloquetStep (2d steps per point), the
+per-point cost of the echo-based engines (out_of_core,
+distributed) and of hardware runs; the sweep engine already gives
+a dense grid in d_max steps and is only used by --check.
+
+Recurrence onset d*: the first evaluated depth where C climbs
+back above the floor after a lasting dip below it, at least
+DWELL consecutive evaluated depths (KI: d* = 10 at N = 12, 14 at
+N = 16). Isolated zeros do not count: the integrable curve
+vanishes at every other depth and Floquet N = 12 grazes the
+floor at d = 1 (C = 2.32e-4 < 2.44e-4); neither has a scrambled
+plateau, and d* is None. `resolved` tells whether the previous
+evaluated depth is d* − 1.
+============================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from otoc_engine import FloquetStep, echo
+
+D_MAX = 64
+
+COARSE_STRIDE = 4
+
+# Presupuesto en pasos de Floquet (eco: 2d pasos por profundidad)
+BUDGET = 4000
+
+# Fracción del presupuesto para la malla gruesa (el resto, para refinar)
+COARSE_SHARE = 0.5
+
+# Salto mínimo de log10 C (décadas) para refinar un intervalo
+JUMP = 1.0
+
+# Profundidades mínimas bajo el suelo para contar como meseta
+DWELL = 3
+
+# C por debajo de esto se trata como cero en log10
+TINY = 1e-300
+
+
+def recurrence_floor(n):
+    """Floor 1/2^N of a scrambled curve."""
+    return 1.0 / 2 ** n
+
+
+def echo_evaluator(model, n, params=None, seed=None):
+    """(evaluate, cost) for the exact echo, one FloquetStep per call."""
+    step = FloquetStep(model, n, params, seed)
+
+    def evaluate(depths):
+        return np.array([echo(step, d) for d in depths])
+
+    def cost(d):
+        return 2 * d
+
+    return evaluate, cost
+
+
+def recurrence_depth(depths, values, floor, dwell=DWELL):
+    """
+    (d*, resolved): first depth back above `floor` after at least
+    `dwell` consecutive evaluated depths below it; (None, False) if
+    there is no such dip.
+    """
+    run = 0
+    prev = None
+    for d, c in zip(depths, values):
+        if c < floor:
+            run += 1
+        elif run >= dwell:
+            return int(d), prev == d - 1
+        else:
+            run = 0
+        prev = d
+    return None, False
+
+
+def _candidates(depths, values, floor, jump):
+    """Midpoints to refine, most urgent first."""
+    out = []
+    logs = np.log10(np.maximum(values, TINY))
+    for k in range(len(depths) - 1):
+        a, b = depths[k], depths[k + 1]
+        if b - a < 2:
+            continue
+        crossing = (values[k] < floor) != (values[k + 1] < floor)
+        step = abs(logs[k + 1] - logs[k])
+        if crossing:
+            out.append((0, -step, a, (a + b) // 2))
+        elif step >= jump and max(values[k], values[k + 1]) >= floor:
+            out.append((1, -step, a, (a + b) // 2))
+    return [m for *_, m in sorted(out)]
+
+
+def _spaced(d_max, stride, ratio):
+    """0, 1, …, stride, then steps of max(stride, ratio · d) up to d_max."""
+    d = min(stride, d_max)
+    grid = list(range(d + 1))
+    while d < d_max:
+        d = min(d_max, d + max(stride, int(ratio * d)))
+        grid.append(d)
+    return grid
+
+
+def coarse_grid(d_max, stride, budget, cost, share=COARSE_SHARE):
+    """
+    Coarse grid of adaptive_depths: uniform every `stride` (the
+    first `stride` depths complete) when it costs ≤ share · budget,
+    else spacing growing as ratio · d, with the smallest ratio that
+    fits, so early depths stay fine and late flat stretches thin out.
+    """
+    stride = max(stride, 1)
+    for ratio in np.arange(0, 10, 0.05):
+        grid = _spaced(d_max, stride, ratio)
+        if sum(cost(d) for d in grid) <= share * budget:
+            return grid
+    grid = sorted(set(range(min(stride, d_max) + 1)) | {d_max})
+    if sum(cost(d) for d in grid) > budget:
+        raise ValueError(f"budget {budget} is below the cost of the coarse grid "
+                         f"({sum(cost(d) for d in grid)} steps)")
+    return grid
+
+
+def adaptive_depths(evaluate, n, d_max=D_MAX, stride=COARSE_STRIDE,
+                    budget=BUDGET, cost=None, jump=JUMP, floor=None):
+    """
+    Adaptive grid for one curve: dict with the irregular depth
+    vector, C(d) on it, d*, resolved, the steps spent and rounds.
+    The coarse grid is thinned to fit the budget (coarse_grid), so
+    `steps` never exceeds `budget`.
+    """
+    if cost is None:
+        def cost(d):
+            return 2 * d
+    if floor is None:
+        floor = recurrence_floor(n)
+
+    grid = coarse_grid(d_max, stride, budget, cost)
+    curve = dict(zip(grid, evaluate(grid)))
+    spent = sum(cost(d) for d in grid)
+    rounds = 0
+
+    while True:
+        depths = sorted(curve)
+        values = np.array([curve[d] for d in depths])
+        batch = []
+        for m in _candidates(depths, values, floor, jump):
+            # Un punto medio caro no impide gastar en otros más baratos
+            if spent + cost(m) > budget:
+                continue
+            batch.append(m)
+            spent += cost(m)
+        if not batch:
+            break
+        curve.update(zip(batch, evaluate(batch)))
+        rounds += 1
+
+    depths = np.array(sorted(curve))
+    values = np.array([curve[d] for d in depths])
+    d_star, resolved = recurrence_depth(depths, values, floor)
+    return {"depths": depths, "values": values, "d_star": d_star,
+            "resolved": resolved, "steps": spent, "rounds": rounds}
+
+
+def adaptive_scan(models, sizes, d_max=D_MAX, stride=COARSE_STRIDE,
+                  budget=BUDGET, params=None, seed=None):
+    """{(model, N): adaptive_depths result} with the echo evaluator."""
+    results = {}
+    for model in models:
+        for n in sizes:
+            evaluate, cost = echo_evaluator(model, n, params, seed)
+            results[model, n] = adaptive_depths(evaluate, n, d_max, stride,
+                                                budget, cost)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive depth scheduler and d*")
+    parser.add_argument("--models", nargs="+", default=["kicked_ising"])
+    parser.add_argument("--n", type=int, nargs="+", default=[12, 16])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--d-max", type=int, default=D_MAX)
+    parser.add_argument("--stride", type=int, default=COARSE_STRIDE)
+    parser.add_argument("--budget", type=int, default=BUDGET,
+                        help="Floquet steps per (model, N)")
+    parser.add_argument("--check", action="store_true",
+                        help="compare d* with a dense sweep 0…d_max")
+    args = parser.parse_args()
+
+    for model in args.models:
+        for n in args.n:
+            t0 = time.perf_counter()
+            res = adaptive_scan([model], [n], args.d_max, args.stride,
+                                args.budget, seed=args.seed)[model, n]
+            elapsed = time.perf_counter() - t0
+            dense = args.d_max * (args.d_max + 1)
+            print(f"{model} N={n}: {len(res['depths'])} profundidades, "
+                  f"{res['steps']} pasos (eco denso: {dense}), "
+                  f"{res['rounds']} rondas  ({elapsed:.2f} s)")
+            print(f"  d* = {res['d_star']}"
+                  f"{'' if res['resolved'] else ' (sin resolver)'}")
+            print(f"  depths = {res['depths'].tolist()}")
+            if args.check:
+                from otoc_engine import otoc_sweep
+                full = np.arange(args.d_max + 1)
+                curve = otoc_sweep(FloquetStep(model, n, seed=args.seed), full)
+                ref, _ = recurrence_depth(full, curve, recurrence_floor(n))
+                print(f"  d* barrido denso = {ref}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+============================================================
+TABLEAU DE ESTABILIZADORES — MODELO INTEGRABLE (H + CNOT)
+============================================================
+Proyecto Kaelion — Paper 1
+
+The integrable step (H on every qubit, then the CNOT chain
+(N−2, N−1), …, (0, 1)) and the whole echo (X_0, Z_1, H_0) are
+Clifford, so the state is a stabilizer state and C(d) is exact on
+an Aaronson–Gottesman tableau: 2N rows (destabilizers and
+stabilizers) plus a scratch row, with the X and Z parts
+bit-packed along the qubits in uint64 words and one phase bit per
+row.
+
+  H, CNOT, X, Z   column updates over all rows, O(N) each,
+                  O(N²) per layer
+  rowsum          vectorized over target rows: the phase of a
+                  product of Pauli rows is 2r_h + 2r_p + Σ g mod 4,
+                  with Σ g from popcounts of the packed words
+  readout         "all_zero" (what the echo records):
+                  P(0…0) = Π_q P(q = 0 | q' < q = 0), by forcing
+                  outcome 0 qubit by qubit (0 or 2^{-k}); "marginal":
+                  P(qubit 0 reads 0)
+
+The layer list is otoc_engine.floquet_layers("integrable", N),
+so the tableau runs exactly the circuit of the statevector
+engine. pauli_curve() is an independent check in the Heisenberg
+picture: W(d) = U^{-d} Z_1 U^d is one Pauli string, W(d)|ψ0⟩ is a
+basis state, and C(d) = 1/2 when the X part of W(d) sits on
+qubit 0 only, else 0; one pass carries W over all depths.
+============================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from otoc_engine import DEPTHS, floquet_layers, inverse_layers
+
+CLIFFORD_MODEL = "integrable"
+
+ESTIMATORS = ("all_zero", "marginal")
+
+_H = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+_ONE = np.uint64(1)
+
+
+def _popcount(a):
+    """Set bits per row of a uint64 array (..., words), as int64."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(a).sum(axis=-1, dtype=np.int64)
+    # NumPy < 2.0: popcount de la vista en bytes
+    a = np.ascontiguousarray(a)
+    bits = np.unpackbits(a.view(np.uint8).reshape(a.shape + (8,)), axis=-1)
+    return bits.reshape(a.shape[:-1] + (-1,)).sum(axis=-1, dtype=np.int64)
+
+
+class Tableau:
+    """Stabilizer tableau of N qubits, |0…0⟩ at construction."""
+
+    def __init__(self, n):
+        self.n = n
+        words = (n + 63) // 64
+        rows = 2 * n + 1
+        self.x = np.zeros((rows, words), dtype=np.uint64)
+        self.z = np.zeros((rows, words), dtype=np.uint64)
+        self.r = np.zeros(rows, dtype=np.uint8)
+        for q in range(n):
+            w, s = self._pos(q)
+            self.x[q, w] = _ONE << s
+            self.z[n + q, w] = _ONE << s
+
+    @staticmethod
+    def _pos(q):
+        return q >> 6, np.uint64(q & 63)
+
+    def copy(self):
+        out = Tableau.__new__(Tableau)
+        out.n = self.n
+        out.x, out.z, out.r = self.x.copy(), self.z.copy(), self.r.copy()
+        return out
+
+    def _col(self, a, q):
+        w, s = self._pos(q)
+        return ((a[:, w] >> s) & _ONE).astype(np.uint8)
+
+    # -------------------- compuertas --------------------
+
+    def h(self, q):
+        w, s = self._pos(q)
+        xq = (self.x[:, w] >> s) & _ONE
+        zq = (self.z[:, w] >> s) & _ONE
+        self.r ^= (xq & zq).astype(np.uint8)
+        flip = (xq ^ zq) << s
+        self.x[:, w] ^= flip
+        self.z[:, w] ^= flip
+
+    def h_all(self):
+        parity = _popcount(self.x & self.z) & 1
+        self.r ^= parity.astype(np.uint8)
+        self.x, self.z = self.z, self.x
+
+    def cnot(self, a, b):
+        wa, sa = self._pos(a)
+        wb, sb = self._pos(b)
+        xa = (self.x[:, wa] >> sa) & _ONE
+        za = (self.z[:, wa] >> sa) & _ONE
+        xb = (self.x[:, wb] >> sb) & _ONE
+        zb = (self.z[:, wb] >> sb) & _ONE
+        self.r ^= (xa & zb & (xb ^ za ^ _ONE)).astype(np.uint8)
+        self.x[:, wb] ^= xa << sb
+        self.z[:, wa] ^= zb << sa
+
+    def pauli_x(self, q):
+        self.r ^= self._col(self.z, q)
+
+    def pauli_z(self, q):
+        self.r ^= self._col(self.x, q)
+
+    def apply_layers(self, layers):
+        """Run an engine layer list made of H layers and CNOTs."""
+        for layer in layers:
+            if layer[0] == "rot" and np.allclose(layer[1], _H):
+                self.h_all()
+            elif layer[0] == "cnot":
+                self.cnot(layer[1], layer[2])
+            else:
+                raise ValueError(f"layer {layer[0]!r} is not H or CNOT")
+        return self
+
+    # -------------------- medida --------------------
+
+    def rowsum(self, targets, p):
+        """Rows `targets` ← row p · row target, with the phase rule."""
+        x1, z1 = self.x[p], self.z[p]
+        x2, z2 = self.x[targets], self.z[targets]
+        plus = (x1 & z1 & z2 & ~x2) | (x1 & ~z1 & z2 & x2) | (~x1 & z1 & x2 & ~z2)
+        minus = (x1 & z1 & x2 & ~z2) | (x1 & ~z1 & z2 & ~x2) | (~x1 & z1 & x2 & z2)
+        g = _popcount(plus) - _popcount(minus)
+        phase = 2 * self.r[targets].astype(np.int64) + 2 * int(self.r[p]) + g
+        self.r[targets] = (phase % 4) >> 1
+        self.x[targets] = x2 ^ x1
+        self.z[targets] = z2 ^ z1
+
+    def measure_zero(self, q):
+        """P(qubit q reads 0), projecting the state on that outcome."""
+        n = self.n
+        xq = self._col(self.x, q)
+        random = np.flatnonzero(xq[n:2 * n])
+        if random.size:
+            p = n + int(random[0])
+            rows = np.flatnonzero(xq[:2 * n])
+            rows = rows[rows != p]
+            if rows.size:
+                self.rowsum(rows, p)
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            w, s = self._pos(q)
+            self.x[p] = 0
+            self.z[p] = 0
+            self.z[p, w] = _ONE << s
+            self.r[p] = 0
+            return 0.5
+        # Resultado determinista: producto de estabilizadores en la fila auxiliar
+        scratch = 2 * n
+        self.x[scratch] = 0
+        self.z[scratch] = 0
+        self.r[scratch] = 0
+        for i in np.flatnonzero(xq[:n]):
+            self.rowsum(np.array([scratch]), n + int(i))
+        return 1.0 if self.r[scratch] == 0 else 0.0
+
+    def zero_probability(self):
+        """P(0…0) of the state (tableau left untouched)."""
+        work = self.copy()
+        prob = 1.0
+        for q in range(self.n):
+            prob *= work.measure_zero(q)
+            if prob == 0.0:
+                break
+        return prob
+
+    def marginal(self, q=0):
+        """P(qubit q reads 0) (tableau left untouched)."""
+        return self.copy().measure_zero(q)
+
+
+def clifford_curve(n, depths=DEPTHS, estimator="all_zero"):
+    """C(d) of the integrable echo on the tableau, one echo per depth."""
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"estimator must be one of {ESTIMATORS}")
+    layers = floquet_layers(CLIFFORD_MODEL, n)
+    inverse = inverse_layers(layers)
+    out = []
+    for d in depths:
+        tab = Tableau(n)
+        tab.pauli_x(0)
+        for _ in range(d):
+            tab.apply_layers(layers)
+        tab.pauli_z(1)
+        for _ in range(d):
+            tab.apply_layers(inverse)
+        tab.h(0)
+        out.append(tab.zero_probability() if estimator == "all_zero"
+                   else tab.marginal(0))
+    return np.array(out)
+
+
+def pauli_curve(n, depths=DEPTHS):
+    """C(d) from the Heisenberg Pauli W(d) = U^{-d} Z_1 U^d (bit ints)."""
+    # U^{-1} W U: compuertas de U en orden inverso (todas autoinversas)
+    gates = list(reversed(floquet_layers(CLIFFORD_MODEL, n)))
+    x, z = 0, 1 << 1
+    values = {}
+    d = 0
+    for target in sorted(set(depths)):
+        while d < target:
+            for layer in gates:
+                if layer[0] == "cnot":
+                    a, b = layer[1], layer[2]
+                    if (x >> a) & 1:
+                        x ^= 1 << b
+                    if (z >> b) & 1:
+                        z ^= 1 << a
+                else:
+                    x, z = z, x
+            d += 1
+        values[d] = 0.5 if x >> 1 == 0 else 0.0
+    return np.array([values[d] for d in depths])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clifford tableau C(d)")
+    parser.add_argument("--n", type=int, default=156)
+    parser.add_argument("--max-depth", type=int, default=max(DEPTHS))
+    parser.add_argument("--check", type=int, default=0,
+                        help="compare with the statevector engine at this N")
+    args = parser.parse_args()
+
+    depths = list(range(1, args.max_depth + 1))
+    t0 = time.perf_counter()
+    curve = clifford_curve(args.n, depths)
+    marginal = clifford_curve(args.n, depths, "marginal")
+    t1 = time.perf_counter()
+    heis = pauli_curve(args.n, depths)
+    t2 = time.perf_counter()
+
+    print(f"integrable N={args.n}: tableau {t1 - t0:.2f} s, "
+          f"Heisenberg {t2 - t1:.3f} s, "
+          f"diferencias {int(np.sum(curve != heis))}/{len(depths)}")
+    for d, c, m in zip(depths, curve, marginal):
+        print(f"  d={d:>3}  C={c:.1f}  P(q0=0)={m:.1f}")
+
+    if args.check:
+        from otoc_engine import otoc_curve
+        exact = otoc_curve(CLIFFORD_MODEL, args.check, depths)
+        tab = clifford_curve(args.check, depths)
+        print(f"  N={args.check}: max |tableau − statevector| = "
+              f"{np.abs(tab - exact).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+============================================================
+STATEVECTOR DISTRIBUIDO — RANKS MPI O MEMORIA COMPARTIDA
+============================================================
+Proyecto Kaelion — Paper 1
+
+The 2^N amplitudes are split over R = 2^g ranks on the top g
+qubits: rank r holds the 2^(N−g) amplitudes whose qubits 0…g−1
+spell r (N = 34 on 16 ranks of 2^30 amplitudes each).
+
+  local qubits   q ≥ g: the engine kernels on the local slice
+  global qubits  q < g: pairwise exchange with the rank that
+                 differs in bit q, in pieces of EXCHANGE_CHUNK
+                 amplitudes, then the same two products as
+                 apply_1q (x0·g00 + g01·x1 or x1·g11 + g10·x0)
+  diagonal       ZZ (+ CZ) codes of the local slice, built once
+                 (the global bits are constants of the rank)
+  P_0            the echo readout |⟨0…0|H_0|ψ⟩|² needs ψ[0] and
+                 ψ[2^(N−1)]; each rank contributes its share and
+                 an allgather sums them in rank order
+
+Every rank runs the echo of otoc_engine (forward d, butterfly,
+backward d) with the gates in the engine's order, so with the
+NumPy kernels C(d) is bit-for-bit otoc_curve(method="echo").
+
+Transports (same three calls: allocate, exchange, allgather):
+  mpi     mpi4py, when the script runs under mpirun with > 1 rank
+  local   one spawned process per rank on this machine; the
+          slices live in multiprocessing.shared_memory, so an
+          exchange is a copy from the partner's slice between
+          two barriers
+
+Usage:
+  mpirun -n 16 python code/distributed.py --n 34
+  python code/distributed.py --n 20 --ranks 8 --check
+============================================================
+"""
+
+import argparse
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import otoc_engine
+from otoc_engine import (DEPTHS, diagonal_bonds, ising_table, model_params,
+                         rotation_gates, z_bits)
+
+DIST_MODELS = ("kicked_ising", "floquet")
+
+# Amplitudes por mensaje de intercambio (64 MB en complex128)
+EXCHANGE_CHUNK = 1 << 22
+
+LOCAL_RANKS = 4
+
+
+def _mpi_world():
+    """COMM_WORLD when mpi4py is installed, else None."""
+    try:
+        from mpi4py import MPI
+    except ImportError:
+        return None
+    return MPI.COMM_WORLD
+
+
+class MPITransport:
+    """Transport over an mpi4py communicator."""
+
+    def __init__(self, comm):
+        self.comm = comm
+        self.rank = comm.Get_rank()
+        self.size = comm.Get_size()
+
+    def allocate(self, amps):
+        return np.zeros(amps, dtype=complex)
+
+    def exchange(self, partner, psi, piece):
+        out = np.empty_like(psi[piece])
+        self.comm.Sendrecv(np.ascontiguousarray(psi[piece]), dest=partner,
+                           recvbuf=out, source=partner)
+        return out
+
+    def allgather(self, value):
+        return self.comm.allgather(value)
+
+
+class SharedMemoryTransport:
+    """One process per rank on this machine; slices in shared memory."""
+
+    def __init__(self, rank, size, names, barrier, slots):
+        self.rank = rank
+        self.size = size
+        self.barrier = barrier
+        self.slots = slots
+        self.segments = [shared_memory.SharedMemory(name=name) for name in names]
+        self.slices = [np.ndarray((s.size // 16,), dtype=complex, buffer=s.buf)
+                       for s in self.segments]
+
+    def allocate(self, amps):
+        psi = self.slices[self.rank][:amps]
+        psi[:] = 0
+        return psi
+
+    def exchange(self, partner, psi, piece):
+        # El socio no escribe su bloque hasta que ambos lo hayan copiado
+        self.barrier.wait()
+        out = self.slices[partner][piece].copy()
+        self.barrier.wait()
+        return out
+
+    def allgather(self, value):
+        self.slots[2 * self.rank] = value.real
+        self.slots[2 * self.rank + 1] = value.imag
+        self.barrier.wait()
+        values = [complex(self.slots[2 * r], self.slots[2 * r + 1])
+                  for r in range(self.size)]
+        self.barrier.wait()
+        return values
+
+    def close(self):
+        del self.slices
+        for s in self.segments:
+            s.close()
+
+
+def global_qubits(size):
+    """g with size = 2^g ranks."""
+    g = size.bit_length() - 1
+    if size != 1 << g:
+        raise ValueError("the number of ranks must be a power of two")
+    return g
+
+
+def slice_codes(model, n, g, rank, params=None):
+    """(codes, table) of the diagonal layer on the slice of `rank`."""
+    p = model_params(model, params)
+    bonds, cz_pairs = diagonal_bonds(model, n, p)
+    m = n - g
+
+    def bit(q):
+        return (rank >> (g - 1 - q)) & 1 if q < g else z_bits(m, q - g)
+
+    walls = np.zeros(1 << m, dtype=np.int16)
+    for i, j in bonds:
+        walls += bit(i) ^ bit(j)
+    table = ising_table(len(bonds), p["J"], bool(cz_pairs))
+    if not cz_pairs:
+        return walls, table
+    cz = np.zeros(1 << m, dtype=np.uint8)
+    for i, j in cz_pairs:
+        cz ^= bit(i) & bit(j)
+    return walls + (len(bonds) + 1) * cz, table
+
+
+class DistributedStep:
+    """Floquet step of kicked_ising / floquet on this rank's slice."""
+
+    def __init__(self, model, n, transport, params=None):
+        if model not in DIST_MODELS:
+            raise ValueError(f"distributed engine covers {DIST_MODELS}")
+        self.model = model
+        self.n = n
+        self.transport = transport
+        self.g = global_qubits(transport.size)
+        self.m = n - self.g
+        if self.m < 1:
+            raise ValueError(f"N={n} is too small for {transport.size} ranks")
+        self.rotations = rotation_gates(model, params)
+        self.codes, self.table = slice_codes(model, n, self.g, transport.rank,
+                                             params)
+
+    def _global_1q(self, psi, gate, q):
+        shift = self.g - 1 - q
+        partner = self.transport.rank ^ (1 << shift)
+        b = (self.transport.rank >> shift) & 1
+        for s in range(0, psi.size, EXCHANGE_CHUNK):
+            piece = slice(s, s + EXCHANGE_CHUNK)
+            other = self.transport.exchange(partner, psi, piece)
+            x = psi[piece]
+            x *= gate[b, b]
+            x += gate[b, 1 - b] * other
+
+    def rotate(self, psi, gate):
+        """Same 2×2 gate on qubits 0…N−1, in the engine's order."""
+        apply_1q = otoc_engine.KERNELS["1q"]
+        for q in range(self.n):
+            if q < self.g:
+                self._global_1q(psi, gate, q)
+            else:
+                apply_1q(psi, gate, q - self.g, self.m)
+
+    def forward(self, psi, steps=1):
+        for _ in range(steps):
+            for gate in self.rotations:
+                self.rotate(psi, gate)
+            otoc_engine.KERNELS["diag"](psi, self.codes, self.table)
+        return psi
+
+    def backward(self, psi, steps=1):
+        inverse = self.table.conj()
+        for _ in range(steps):
+            otoc_engine.KERNELS["diag"](psi, self.codes, inverse)
+            for gate in reversed(self.rotations):
+                self.rotate(psi, gate.conj().T)
+        return psi
+
+    def butterfly(self, psi):
+        """Z on qubit 1."""
+        if self.g > 1:
+            if (self.transport.rank >> (self.g - 2)) & 1:
+                psi *= -1
+        else:
+            psi.reshape(-1, 2, 1 << (self.n - 2))[:, 1, :] *= -1
+
+    def amplitude(self, psi, x):
+        """This rank's share of ψ[x] (0 unless it holds x)."""
+        if x >> self.m == self.transport.rank:
+            return complex(psi[x & ((1 << self.m) - 1)])
+        return 0j
+
+
+def rank_curve(transport, model, n, depths=DEPTHS, params=None):
+    """C(d) by the echo protocol, run by every rank (SPMD)."""
+    step = DistributedStep(model, n, transport, params)
+    psi = transport.allocate(1 << step.m)
+    top = 1 << (n - 1)
+    values = []
+    for d in depths:
+        psi[:] = 0
+        if top >> step.m == transport.rank:
+            psi[top & ((1 << step.m) - 1)] = 1.0
+        step.forward(psi, d)
+        step.butterfly(psi)
+        step.backward(psi, d)
+        share = step.amplitude(psi, 0) + step.amplitude(psi, top)
+        amp = 0j
+        for v in transport.allgather(share):
+            amp += v
+        values.append(float(abs(amp) ** 2 / 2))
+    return np.array(values)
+
+
+def _local_rank(rank, size, names, barrier, slots, results, model, n, depths,
+                params):
+    transport = SharedMemoryTransport(rank, size, names, barrier, slots)
+    try:
+        curve = rank_curve(transport, model, n, depths, params)
+        results.put((rank, curve, None))
+    except Exception as exc:
+        # Los demás ranks salen de su barrera con BrokenBarrierError
+        barrier.abort()
+        results.put((rank, None, repr(exc)))
+    finally:
+        transport.close()
+
+
+def distributed_curve(model, n, depths=DEPTHS, params=None, ranks=LOCAL_RANKS,
+                      transport="auto"):
+    """
+    C(d) on the distributed engine. transport="mpi" (or "auto"
+    under mpirun) runs this rank's share and returns the curve on
+    every rank; "local" spawns `ranks` processes on this machine.
+    """
+    world = _mpi_world() if transport in ("auto", "mpi") else None
+    if transport == "mpi" and world is None:
+        raise ValueError("transport='mpi' needs mpi4py")
+    if world is not None and (transport == "mpi" or world.Get_size() > 1):
+        return rank_curve(MPITransport(world), model, n, depths, params)
+
+    g = global_qubits(ranks)
+    nbytes = (1 << (n - g)) * 16
+    segments = [shared_memory.SharedMemory(create=True, size=nbytes)
+                for _ in range(ranks)]
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(ranks)
+    slots = ctx.Array("d", 2 * ranks, lock=False)
+    results = ctx.Queue()
+    names = [s.name for s in segments]
+    procs = [ctx.Process(target=_local_rank,
+                         args=(r, ranks, names, barrier, slots, results, model,
+                               n, list(depths), params))
+             for r in range(ranks)]
+    try:
+        for p in procs:
+            p.start()
+        outcome = dict((r, (c, e)) for r, c, e in
+                       (results.get() for _ in range(ranks)))
+        for p in procs:
+            p.join()
+    finally:
+        for s in segments:
+            s.close()
+            s.unlink()
+    errors = [e for _, e in outcome.values() if e is not None]
+    if errors:
+        raise RuntimeError(f"distributed run failed: {errors[0]}")
+    return outcome[0][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed statevector C(d)")
+    parser.add_argument("--model", default="kicked_ising", choices=DIST_MODELS)
+    parser.add_argument("--n", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--ranks", type=int, default=LOCAL_RANKS,
+                        help="processes of the local transport")
+    parser.add_argument("--transport", default="auto",
+                        choices=("auto", "mpi", "local"))
+    parser.add_argument("--check", action="store_true",
+                        help="compare bit for bit with the single-process echo")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    curve = distributed_curve(args.model, args.n, args.depths, ranks=args.ranks,
+                              transport=args.transport)
+    elapsed = time.perf_counter() - t0
+
+    world = _mpi_world()
+    if world is not None and world.Get_rank() != 0:
+        return
+    print(f"{args.model} N={args.n}  ({elapsed:.2f} s)")
+    for d, c in zip(args.depths, curve):
+        print(f"  d={d:>2}  C={c:.16e}")
+    if args.check:
+        from otoc_engine import otoc_curve
+        ref = otoc_curve(args.model, args.n, args.depths, method="echo")
+        same = int(np.sum(curve == ref))
+        print(f"  idénticos bit a bit: {same}/{len(ref)}  "
+              f"(max |Δ| = {np.abs(curve - ref).max():.1e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+============================================================
+NÚCLEOS DE COMPUERTAS — NUMPY, HILOS POR BLOQUES Y NUMBA
+============================================================
+Proyecto Kaelion — Paper 1
+
+Every layer of the four models reaches the state through four
+in-place kernels of otoc_engine:
+
+  "1q"     2×2 gate on one qubit (RX, RY, H)
+  "cnot"   CNOT(control → target)
+  "diag"   psi *= table[codes]   (Ising RZZ phase, CZ)
+  "phase"  psi *= vec            (SYK energies)
+
+apply_layers() looks them up in otoc_engine.KERNELS, and
+set_backend() swaps the whole table at runtime:
+
+  numpy    reference implementation (the engine's own functions)
+  threads  the same NumPy contractions cut into slabs of SLAB
+           amplitudes along the free axes and run on a thread
+           pool (NumPy releases the GIL); temporaries are one
+           slab, so they stay in cache even with a single thread
+  numba    JIT kernels with prange over amplitude pairs, no
+           temporaries; falls back to "threads" with a warning
+           when Numba is not installed
+
+All backends accept the batched (..., 2^N) arrays of the engine
+and give the same state to rounding (see `python kernels.py`).
+Thread count: `threads` argument of set_backend, default the
+number of CPUs (NUMBA_NUM_THREADS caps the Numba pool).
+============================================================
+"""
+
+import argparse
+import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import otoc_engine
+from otoc_engine import FloquetStep, apply_1q, apply_cnot, apply_diag, apply_phase
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+KERNEL_BACKENDS = ("numpy", "threads", "numba")
+
+# Amplitudes por bloque (1 MB en complex128)
+SLAB = 1 << 16
+
+_state = {"backend": "numpy", "threads": os.cpu_count() or 1, "pool": None}
+
+
+def available_backends():
+    """Backends that can run here."""
+    return [b for b in KERNEL_BACKENDS if b != "numba" or numba is not None]
+
+
+def current_backend():
+    return _state["backend"]
+
+
+# ============================================================
+# BACKEND "threads": BLOQUES SOBRE UN POOL DE HILOS
+# ============================================================
+
+def _run(fn, slabs, *args):
+    if _state["threads"] <= 1 or len(slabs) == 1:
+        for slab in slabs:
+            fn(slab, *args)
+        return
+    if _state["pool"] is None:
+        _state["pool"] = ThreadPoolExecutor(_state["threads"])
+    list(_state["pool"].map(lambda slab: fn(slab, *args), slabs))
+
+
+def _split(v, axes):
+    """Views of v cut into ~SLAB-sized slabs along the longest of `axes`."""
+    axis = max(axes, key=lambda a: v.shape[a])
+    pieces = max(1, min(v.shape[axis], v.size // SLAB))
+    width = -(-v.shape[axis] // pieces)
+    index = [slice(None)] * v.ndim
+    slabs = []
+    for s in range(0, v.shape[axis], width):
+        index[axis] = slice(s, s + width)
+        slabs.append(v[tuple(index)])
+    return slabs
+
+
+def _rot_slab(v, gate):
+    x0 = v[:, 0, :]
+    x1 = v[:, 1, :]
+    t = x0.copy()
+    x0 *= gate[0, 0]
+    x0 += gate[0, 1] * x1
+    x1 *= gate[1, 1]
+    x1 += gate[1, 0] * t
+
+
+def _swap_slab(v, control_first):
+    if control_first:
+        a, b = v[:, 1, :, 0, :], v[:, 1, :, 1, :]
+    else:
+        a, b = v[:, 0, :, 1, :], v[:, 1, :, 1, :]
+    t = a.copy()
+    a[...] = b
+    b[...] = t
+
+
+def _scale_slab(bounds, psi, codes, table):
+    s, e = bounds
+    if table is None:
+        psi[..., s:e] *= codes[s:e]
+    else:
+        psi[..., s:e] *= table[codes[s:e]]
+
+
+def threaded_1q(psi, gate, q, n):
+    v = psi.reshape(-1, 2, 1 << (n - 1 - q))
+    _run(_rot_slab, _split(v, (0, 2)), gate)
+
+
+def threaded_cnot(psi, control, target, n):
+    lo, hi = sorted((control, target))
+    v = psi.reshape(-1, 2, 1 << (hi - lo - 1), 2, 1 << (n - 1 - hi))
+    _run(_swap_slab, _split(v, (0, 2, 4)), control < target)
+
+
+def threaded_diag(psi, codes, table):
+    width = max(1, SLAB * codes.size // psi.size)
+    bounds = [(s, s + width) for s in range(0, codes.size, width)]
+    _run(_scale_slab, bounds, psi, codes, table)
+
+
+def threaded_phase(psi, vec):
+    threaded_diag(psi, vec, None)
+
+
+# ============================================================
+# BACKEND "numba": JIT CON prange
+# ============================================================
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _nb_1q(flat, g00, g01, g10, g11, shift):
+        low = (1 << shift) - 1
+        for k in numba.prange(flat.size // 2):
+            i0 = ((k >> shift) << (shift + 1)) | (k & low)
+            i1 = i0 | (1 << shift)
+            a = flat[i0]
+            b = flat[i1]
+            flat[i0] = g00 * a + g01 * b
+            flat[i1] = g10 * a + g11 * b
+
+    @numba.njit(parallel=True, cache=True)
+    def _nb_cnot(flat, bit_c, bit_t):
+        lo, hi = min(bit_c, bit_t), max(bit_c, bit_t)
+        for k in numba.prange(flat.size // 4):
+            i = ((k >> lo) << (lo + 1)) | (k & ((1 << lo) - 1))
+            i = ((i >> hi) << (hi + 1)) | (i & ((1 << hi) - 1))
+            i0 = i | (1 << bit_c)
+            i1 = i0 | (1 << bit_t)
+            t = flat[i0]
+            flat[i0] = flat[i1]
+            flat[i1] = t
+
+    @numba.njit(parallel=True, cache=True)
+    def _nb_diag(flat, codes, table):
+        dim = codes.size
+        for i in numba.prange(dim):
+            p = table[codes[i]]
+            for r in range(flat.size // dim):
+                flat[r * dim + i] *= p
+
+    @numba.njit(parallel=True, cache=True)
+    def _nb_phase(flat, vec):
+        dim = vec.size
+        for i in numba.prange(dim):
+            p = vec[i]
+            for r in range(flat.size // dim):
+                flat[r * dim + i] *= p
+
+
+def numba_1q(psi, gate, q, n):
+    if not psi.flags.c_contiguous:
+        return apply_1q(psi, gate, q, n)
+    g = gate.astype(psi.dtype)
+    _nb_1q(psi.reshape(-1), g[0, 0], g[0, 1], g[1, 0], g[1, 1], n - 1 - q)
+
+
+def numba_cnot(psi, control, target, n):
+    if not psi.flags.c_contiguous:
+        return apply_cnot(psi, control, target, n)
+    _nb_cnot(psi.reshape(-1), n - 1 - control, n - 1 - target)
+
+
+def numba_diag(psi, codes, table):
+    if not psi.flags.c_contiguous:
+        return apply_diag(psi, codes, table)
+    _nb_diag(psi.reshape(-1), codes, table.astype(psi.dtype))
+
+
+def numba_phase(psi, vec):
+    if not psi.flags.c_contiguous:
+        return apply_phase(psi, vec)
+    _nb_phase(psi.reshape(-1), vec.astype(psi.dtype))
+
+
+_TABLES = {
+    "numpy": {"1q": apply_1q, "cnot": apply_cnot, "diag": apply_diag,
+              "phase": apply_phase},
+    "threads": {"1q": threaded_1q, "cnot": threaded_cnot,
+                "diag": threaded_diag, "phase": threaded_phase},
+    "numba": {"1q": numba_1q, "cnot": numba_cnot, "diag": numba_diag,
+              "phase": numba_phase},
+}
+
+
+def set_backend(name="numpy", threads=None):
+    """Install the kernels of `name` in otoc_engine; returns the backend used."""
+    if name not in KERNEL_BACKENDS:
+        raise ValueError(f"kernel backend must be one of {KERNEL_BACKENDS}")
+    if name == "numba" and numba is None:
+        warnings.warn("numba is not installed; using the 'threads' backend")
+        name = "threads"
+    if threads is not None and threads != _state["threads"]:
+        if _state["pool"] is not None:
+            _state["pool"].shutdown()
+            _state["pool"] = None
+        _state["threads"] = max(1, int(threads))
+    if name == "numba":
+        numba.set_num_threads(min(_state["threads"],
+                                  numba.config.NUMBA_NUM_THREADS))
+    otoc_engine.KERNELS.update(_TABLES[name])
+    _state["backend"] = name
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kernel backend benchmark")
+    parser.add_argument("--model", default="kicked_ising",
+                        choices=otoc_engine.MODELS)
+    parser.add_argument("--n", type=int, default=22)
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    step = FloquetStep(args.model, args.n, seed=args.seed)
+    rng = np.random.default_rng(0)
+    psi0 = rng.normal(size=1 << args.n) + 1j * rng.normal(size=1 << args.n)
+    psi0 /= np.linalg.norm(psi0)
+
+    print(f"{args.model} N={args.n}, {args.steps} pasos Floquet "
+          f"(hilos: {args.threads or _state['threads']})")
+    ref = None
+    for name in available_backends():
+        set_backend(name, args.threads)
+        # Un paso de calentamiento (compilación JIT)
+        step.forward(psi0.copy(), 1)
+        psi = psi0.copy()
+        t0 = time.perf_counter()
+        step.forward(psi, args.steps)
+        elapsed = (time.perf_counter() - t0) / args.steps
+        if ref is None:
+            ref = psi
+        print(f"  {name:<8} {elapsed:7.3f} s/paso   "
+              f"max |Δψ| vs numpy = {np.abs(psi - ref).max():.1e}")
+    set_backend("numpy")
+
+
+if __name__ == "__main__":
+    main()
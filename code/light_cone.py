@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+============================================================
+CONO DE LUZ — OTOC TRUNCADO PARA N GRANDE
+============================================================
+Proyecto Kaelion — Paper 1
+
+For the nearest-neighbour models (kicked_ising, floquet) the
+echo amplitude is
+
+  A(d) = ⟨+ 0…0| W(d) |1 0…0⟩,   W(d) = U^{-d} Z_1 U^d,
+
+and W(d) only acts on the Heisenberg support of Z_1 after d
+steps. Both end states are products, so every qubit outside that
+support contributes ⟨0|0⟩ = 1 and C(d) = |A(d)|² is the echo of
+a register holding only the support (plus qubit 0). This is why
+C(1) and C(2) agree for every N.
+
+cone_support() follows Z_1 backwards through the layers: a
+rotation layer makes it non-diagonal, and a diagonal layer
+grows it along the bonds it touches only when it is no longer
+diagonal (the last ZZ layer commutes with Z_1). Gates that cross
+the register boundary lie outside the cone and cancel between
+U^d and U^{-d}, so the register step keeps only the bonds and
+CZ pairs inside it; the result is exact, not an approximation.
+
+For KI and Floquet the support is the 2d − 1 sites around
+qubit 1. All depths whose cone fits are run as one sweep on the
+register of the deepest of them, at a cost set by d and not N.
+Depths whose cone wraps the periodic chain fall back to the full
+state.
+============================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from otoc_engine import (DEPTHS, FloquetStep, diagonal_bonds, floquet_layers,
+                         inverse_layers, ising_layer, model_params, otoc_sweep,
+                         rotation_gates)
+
+LIGHT_CONE_MODELS = ("kicked_ising", "floquet")
+
+# Registro máximo (2^26 amplitudes complex128 = 1 GB)
+CONE_MAX_QUBITS = 26
+
+
+def cone_support(model, n, d, params=None):
+    """Sites in the support of U^{-d} Z_1 U^d (sorted)."""
+    if model not in LIGHT_CONE_MODELS:
+        raise ValueError(f"light cone needs one of {LIGHT_CONE_MODELS}")
+    bonds, cz_pairs = diagonal_bonds(model, n, params)
+    pairs = bonds + cz_pairs
+    kinds = [layer[0] for layer in floquet_layers(model, 2, params)]
+
+    support = {1}
+    diagonal = True
+    for _ in range(d):
+        for kind in reversed(kinds):
+            if kind == "rot":
+                diagonal = False
+            elif not diagonal:
+                support |= {j for i, j in pairs if i in support}
+                support |= {i for i, j in pairs if j in support}
+    return sorted(support)
+
+
+def cone_register(model, n, d, params=None):
+    """Global sites of the register, ordered with qubits 0 and 1 first."""
+    rest = [q for q in cone_support(model, n, d, params) if q > 1]
+    return [0, 1] + rest
+
+
+class ConeStep(FloquetStep):
+    """Floquet step restricted to the register `sites` of an N-qubit ring."""
+
+    def __init__(self, model, n, sites, params=None):
+        self.model = model
+        self.n = len(sites)
+        self.params = model_params(model, params)
+        self.seed = None
+        self.sites = list(sites)
+        local = {q: i for i, q in enumerate(self.sites)}
+
+        def inside(pairs):
+            return [(local[i], local[j]) for i, j in pairs
+                    if i in local and j in local]
+
+        bonds, cz_pairs = diagonal_bonds(model, n, params)
+        # Las rotaciones no dependen de N; la capa diagonal se rehace
+        rot = [("rot", gate) for gate in rotation_gates(model, params)]
+        self.layers = rot + [ising_layer(self.n, inside(bonds),
+                                         self.params["J"], inside(cz_pairs))]
+        self.inverse = inverse_layers(self.layers)
+
+
+def light_cone_curve(model, n, depths=DEPTHS, params=None,
+                     max_qubits=CONE_MAX_QUBITS):
+    """
+    C(d) for `depths` on an N-qubit chain, simulating only the cone.
+
+    Returns (curve, register size per depth); the size is N for
+    depths that fall back to the full state.
+    """
+    sizes = {d: len(cone_register(model, n, d, params)) for d in set(depths)}
+    local = sorted(d for d in sizes if sizes[d] < n)
+    full = sorted(d for d in sizes if sizes[d] >= n)
+
+    values = {}
+    if local:
+        sites = cone_register(model, n, local[-1], params)
+        if len(sites) > max_qubits:
+            raise ValueError(f"cone of d={local[-1]} needs {len(sites)} "
+                             f"qubits (max {max_qubits})")
+        step = ConeStep(model, n, sites, params)
+        values.update(zip(local, otoc_sweep(step, local)))
+    if full:
+        if n > max_qubits:
+            raise ValueError(f"cone of d={full[0]} wraps the N={n} chain")
+        values.update(zip(full, otoc_sweep(FloquetStep(model, n, params), full)))
+    return (np.array([values[d] for d in depths]),
+            np.array([min(sizes[d], n) for d in depths]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Light-cone OTOC C(d)")
+    parser.add_argument("--model", default="kicked_ising",
+                        choices=LIGHT_CONE_MODELS)
+    parser.add_argument("--n", type=int, default=156)
+    parser.add_argument("--depths", type=int, nargs="+",
+                        default=[d for d in DEPTHS if d <= 10])
+    parser.add_argument("--check", type=int, default=0,
+                        help="compare against the full state at this N")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    curve, sizes = light_cone_curve(args.model, args.n, args.depths)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{args.model} N={args.n}  ({elapsed:.2f} s)")
+    for d, c, L in zip(args.depths, curve, sizes):
+        print(f"  d={d:>2}  C={c:.6e}  registro={L} qubits")
+
+    if args.check:
+        cone, _ = light_cone_curve(args.model, args.check, args.depths)
+        exact = otoc_sweep(FloquetStep(args.model, args.check), args.depths)
+        print(f"  N={args.check}: max |cono − exacta| = "
+              f"{np.abs(cone - exact).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
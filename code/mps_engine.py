@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+============================================================
+MOTOR MPS / TEBD — OTOC MÁS ALLÁ DE LA MEMORIA DEL STATEVECTOR
+============================================================
+Proyecto Kaelion — Paper 1
+
+Matrix-product-state backend for the echo of kicked_ising and
+floquet, with the gates of otoc_engine (rotation_gates,
+diagonal_bonds): the rotations act site by site and the diagonal
+layer is a product of commuting two-site gates exp(-iJ Z_i Z_j)
+(times CZ on the Floquet pairs).
+
+Like otoc_sweep, C(d) = |⟨χ_d|Z_1|ψ_d⟩|² with ψ_d = U^d X_0|0…0⟩
+and χ_d = U^d H_0|0…0⟩, so both MPS are carried forward once
+across all depths and every C(d) is one transfer-matrix overlap.
+
+Bond layers sweep left→right and right→left alternately, keeping
+the orthogonality centre on the gate, so every SVD truncation is
+optimal. The periodic bond (N−1, 0) is applied by swapping site
+N−1 down to position 1 and back. Each SVD keeps at most
+`max_bond` singular values above `cutoff` (relative); its
+discarded weight ε = Σ s²_dropped / Σ s² multiplies the state
+fidelity estimate F = Π (1 − ε), and the report per depth is the
+truncation error 1 − F_ψ F_χ with the largest bond reached.
+
+C(d) is an exponentially small overlap of two volume-law states,
+so it is only trustworthy while the truncation error stays well
+below C(d) itself: at χ = 64 that is d ≤ 3 for KI, whatever N.
+For deeper circuits at large N, light_cone.py is exact up to
+d ≈ 12; this backend is for the early-depth scaling at N = 40–64
+and for other nearest-neighbour circuits.
+============================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from otoc_engine import DEPTHS, diagonal_bonds, model_params, rotation_gates
+
+MPS_MODELS = ("kicked_ising", "floquet")
+
+MAX_BOND = 64
+CUTOFF = 1e-12
+
+_SWAP = np.eye(4).reshape(2, 2, 2, 2).transpose(1, 0, 2, 3)
+
+
+class MPS:
+    """Open-boundary MPS, tensors (left, phys, right), with truncation log."""
+
+    def __init__(self, sites, max_bond=MAX_BOND, cutoff=CUTOFF):
+        self.tensors = [np.asarray(s, dtype=complex).reshape(1, 2, 1)
+                        for s in sites]
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        self.center = 0
+        self.fidelity = 1.0
+
+    @property
+    def n(self):
+        return len(self.tensors)
+
+    @property
+    def bond(self):
+        return max(t.shape[2] for t in self.tensors)
+
+    def apply_1q(self, gate, q):
+        self.tensors[q] = np.einsum("ab,lbr->lar", gate, self.tensors[q])
+
+    def apply_2q(self, gate, i, move="right"):
+        """Gate (out_i, out_j, in_i, in_j) on sites i, i+1, then truncate."""
+        a, b = self.tensors[i], self.tensors[i + 1]
+        theta = np.einsum("lar,rbs,cdab->lcds", a, b, gate)
+        dl, _, _, dr = theta.shape
+        u, s, vh = np.linalg.svd(theta.reshape(dl * 2, 2 * dr),
+                                 full_matrices=False)
+        total = np.sum(s ** 2)
+        keep = min(self.max_bond, int(np.sum(s > self.cutoff * s[0])))
+        self.fidelity *= 1.0 - np.sum(s[keep:] ** 2) / total
+        u, s, vh = u[:, :keep], s[:keep], vh[:keep]
+        s = s / np.sqrt(np.sum(s ** 2))
+        if move == "right":
+            u, vh = u, s[:, None] * vh
+            self.center = i + 1
+        else:
+            u, vh = u * s, vh
+            self.center = i
+        self.tensors[i] = u.reshape(dl, 2, keep)
+        self.tensors[i + 1] = vh.reshape(keep, 2, dr)
+
+
+def bond_gate(J, cz=False):
+    """exp(-iJ Z_i Z_j) (· CZ) as a (2, 2, 2, 2) diagonal gate."""
+    z = np.array([1.0, -1.0])
+    phase = np.exp(-1j * J * np.outer(z, z))
+    if cz:
+        phase[1, 1] *= -1
+    gate = np.zeros((2, 2, 2, 2), dtype=complex)
+    for a in range(2):
+        for b in range(2):
+            gate[a, b, a, b] = phase[a, b]
+    return gate
+
+
+def bond_gates(model, n, params=None):
+    """({i: gate on (i, i+1)}, wrap gate on (N−1, 0) or None)."""
+    p = model_params(model, params)
+    bonds, cz_pairs = diagonal_bonds(model, n, p)
+    cz = {frozenset(pair) for pair in cz_pairs}
+    local, wrap = {}, None
+    for i, j in bonds:
+        gate = bond_gate(p["J"], frozenset((i, j)) in cz)
+        if j == i + 1:
+            local[i] = gate
+        else:
+            # (N-1, 0): el sitio N-1 se mueve a la posición 1
+            wrap = gate.transpose(1, 0, 3, 2)
+    return local, wrap
+
+
+def _apply_wrap(mps, gate):
+    n = mps.n
+    for i in range(n - 2, 0, -1):
+        mps.apply_2q(_SWAP, i, "left")
+    mps.apply_2q(gate, 0, "right")
+    for i in range(1, n - 1):
+        mps.apply_2q(_SWAP, i, "right")
+
+
+def apply_step(mps, rotations, local, wrap):
+    """One Floquet step on the MPS, in place."""
+    n = mps.n
+    for gate in rotations:
+        for q in range(n):
+            mps.apply_1q(gate, q)
+    # Las capas alternan el sentido del barrido según el centro
+    if mps.center == 0:
+        for i in range(n - 1):
+            mps.apply_2q(local[i], i, "right")
+        if wrap is not None:
+            _apply_wrap(mps, wrap)
+    else:
+        if wrap is not None:
+            _apply_wrap(mps, wrap)
+        for i in range(n - 2, -1, -1):
+            mps.apply_2q(local[i], i, "left")
+    return mps
+
+
+def overlap(chi, psi, ops=None):
+    """⟨chi|O|psi⟩ for a product operator {site: 2×2}."""
+    ops = ops or {}
+    env = np.ones((1, 1), dtype=complex)
+    for q, (c, p) in enumerate(zip(chi.tensors, psi.tensors)):
+        if q in ops:
+            p = np.einsum("ab,lbr->lar", ops[q], p)
+        env = np.einsum("ab,asc,bsd->cd", env, c.conj(), p)
+    return complex(env[0, 0])
+
+
+def mps_curve(model, n, depths=DEPTHS, params=None, max_bond=MAX_BOND,
+              cutoff=CUTOFF):
+    """
+    C(d) for `depths` plus a report with, per depth, the largest
+    bond dimension and the truncation error 1 − F_ψ F_χ.
+    """
+    if model not in MPS_MODELS:
+        raise ValueError(f"MPS backend covers {MPS_MODELS}")
+    if n < 3:
+        raise ValueError("the MPS backend needs at least 3 qubits")
+    rotations = rotation_gates(model, params)
+    local, wrap = bond_gates(model, n, params)
+
+    zero, one = np.array([1.0, 0.0]), np.array([0.0, 1.0])
+    psi = MPS([one] + [zero] * (n - 1), max_bond, cutoff)
+    chi = MPS([np.array([1.0, 1.0]) / np.sqrt(2)] + [zero] * (n - 1),
+              max_bond, cutoff)
+    z1 = {1: np.diag([1.0, -1.0])}
+
+    values, bonds, error = {}, {}, {}
+    d = 0
+    for target in sorted(set(depths)):
+        for _ in range(target - d):
+            apply_step(psi, rotations, local, wrap)
+            apply_step(chi, rotations, local, wrap)
+        d = target
+        values[d] = abs(overlap(chi, psi, z1)) ** 2
+        bonds[d] = max(psi.bond, chi.bond)
+        error[d] = 1.0 - psi.fidelity * chi.fidelity
+    return (np.array([values[d] for d in depths]),
+            {"max_bond": np.array([bonds[d] for d in depths]),
+             "truncation": np.array([error[d] for d in depths])})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MPS / TEBD OTOC C(d)")
+    parser.add_argument("--model", default="kicked_ising", choices=MPS_MODELS)
+    parser.add_argument("--n", type=int, default=40)
+    parser.add_argument("--chi", type=int, default=MAX_BOND,
+                        help="maximum bond dimension")
+    parser.add_argument("--cutoff", type=float, default=CUTOFF)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    curve, report = mps_curve(args.model, args.n, max_bond=args.chi,
+                              cutoff=args.cutoff)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{args.model} N={args.n} χ={args.chi}  ({elapsed:.2f} s)")
+    for d, c, b, e in zip(DEPTHS, curve, report["max_bond"],
+                          report["truncation"]):
+        print(f"  d={d:>2}  C={c:.6e}  χ_max={b:>4}  error de truncado={e:.2e}")
+
+
+if __name__ == "__main__":
+    main()
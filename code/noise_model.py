@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+============================================================
+MODELO DE RUIDO POR TRAYECTORIAS — NOISE FLOOR DEL HARDWARE
+============================================================
+Proyecto Kaelion — Paper 1
+
+Predicts the hardware noise floor ⟨C(d ≥ 6)⟩ from error rates
+instead of the 1/2^N guide of the analysis. The echo circuit of
+otoc_engine runs on T stochastic trajectories at once, held as
+one (T, 2^N) array; after every layer each trajectory draws its
+errors independently:
+
+  depolarizing       Pauli X/Y/Z with probability p1 per qubit
+                     after a rotation layer, p2 per qubit after
+                     an entangling layer (diag/phase on every
+                     qubit, cnot on its two qubits)
+  amplitude damping  quantum jump |1⟩→|0⟩ with probability
+                     γ·P(q = 1), otherwise the no-jump Kraus
+                     operator; trajectories are renormalized
+  readout            confusion weights on the final distribution:
+                     0 read as 1 with e01, 1 read as 0 with e10
+
+The butterfly Z_1 and the final H_0 count as rotation layers.
+The forward half is shared across depths (one noisy trajectory
+is carried to the deepest d and copied at each depth), so a
+whole curve costs d_max + Σ d layers per trajectory.
+
+fit_error_rates() grid-searches p2 and the readout asymmetry
+against the IBM floors of KI N = 8 and 12 (log residuals).
+============================================================
+"""
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from otoc_engine import (DEPTHS, FloquetStep, apply_1q, apply_butterfly,
+                         apply_cnot, initial_state, z_bits)
+
+# Tasas por defecto (mediana de ibm_marrakesh; γ ≈ t_capa / T1)
+NOISE = {"p1": 2e-4, "p2": 8e-3, "gamma": 3e-4, "e01": 0.015, "e10": 0.015}
+
+READOUT = ("e01", "e10")
+
+TRAJECTORIES = 64
+FLOOR_DEPTH = 6
+
+_H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+
+
+def noise_params(noise=None):
+    """NOISE with the given overrides."""
+    merged = dict(NOISE)
+    merged.update(noise or {})
+    unknown = set(merged) - set(NOISE)
+    if unknown:
+        raise ValueError(f"unknown noise parameters {sorted(unknown)}")
+    return merged
+
+
+# ============================================================
+# CANALES SOBRE EL LOTE DE TRAYECTORIAS
+# ============================================================
+
+def _qubit_view(psi, q, n):
+    """(T, high, 2, low) view with qubit q on axis 2."""
+    return psi.reshape(psi.shape[0], -1, 2, 1 << (n - 1 - q))
+
+
+def depolarize(psi, qubits, p, n, rng):
+    """Random Pauli on each qubit with probability p, per trajectory."""
+    if p <= 0:
+        return psi
+    t = psi.shape[0]
+    for q in qubits:
+        hit = rng.random(t) < p
+        if not hit.any():
+            continue
+        pauli = rng.integers(1, 4, t)
+        v = _qubit_view(psi, q, n)
+        # Y = iXZ: la fase global no cambia las probabilidades
+        flip = hit & (pauli != 3)
+        sign = hit & (pauli != 1)
+        if flip.any():
+            v[flip] = v[flip][:, :, ::-1, :]
+        if sign.any():
+            v[sign, :, 1, :] *= -1
+    return psi
+
+
+def excitations(n, qubits):
+    """Number of excited qubits among `qubits` for every basis index."""
+    out = np.zeros(1 << n, dtype=np.int64)
+    for q in qubits:
+        out += z_bits(n, q)
+    return out
+
+
+def amplitude_damp(psi, qubits, gamma, n, rng):
+    """Amplitude-damping quantum jumps on each qubit, per trajectory."""
+    if gamma <= 0:
+        return psi
+    t = psi.shape[0]
+    keep = np.sqrt(1.0 - gamma)
+    # Un salto exige u < γ·P(q=1) ≤ γ: sin candidatos basta el Kraus sin salto
+    u = rng.random((t, len(qubits)))
+    cand = (u < gamma).any(axis=1)
+    psi[~cand] *= keep ** excitations(n, qubits)
+    if cand.any():
+        sub = psi[cand]
+        for j, q in enumerate(qubits):
+            v = _qubit_view(sub, q, n)
+            excited = (np.abs(v[:, :, 1, :]) ** 2).sum(axis=(1, 2))
+            excited /= (np.abs(sub) ** 2).sum(axis=1)
+            jump = u[cand, j] < gamma * excited
+            v[jump, :, 0, :] = v[jump, :, 1, :]
+            v[jump, :, 1, :] = 0
+            v[~jump, :, 1, :] *= keep
+        psi[cand] = sub
+    psi /= np.linalg.norm(psi, axis=1, keepdims=True)
+    return psi
+
+
+def _noisy_layers(psi, layers, n, noise, rng):
+    every = tuple(range(n))
+    for layer in layers:
+        kind = layer[0]
+        if kind == "rot":
+            for q in every:
+                apply_1q(psi, layer[1], q, n)
+            touched, p = every, noise["p1"]
+        elif kind == "diag":
+            psi *= layer[2][layer[1]]
+            touched, p = every, noise["p2"]
+        elif kind == "phase":
+            psi *= layer[1]
+            touched, p = every, noise["p2"]
+        elif kind == "cnot":
+            apply_cnot(psi, layer[1], layer[2], n)
+            touched, p = (layer[1], layer[2]), noise["p2"]
+        else:
+            raise ValueError(f"unknown layer kind {kind!r}")
+        depolarize(psi, touched, p, n, rng)
+        amplitude_damp(psi, touched, noise["gamma"], n, rng)
+    return psi
+
+
+def readout_weights(n, e01, e10):
+    """P(read 0…0 | basis state x) for every x, shape (2^N,)."""
+    w = np.ones(1)
+    for _ in range(n):
+        w = np.multiply.outer(w, [1.0 - e01, e10]).ravel()
+    return w
+
+
+# ============================================================
+# CURVAS Y FLOORS CON RUIDO
+# ============================================================
+
+def noisy_distribution(model, n, depths=DEPTHS, params=None, seed=None,
+                       noise=None, trajectories=TRAJECTORIES, rng=None):
+    """Trajectory-averaged outcome probabilities, shape (depths, 2^N)."""
+    noise = noise_params(noise)
+    rng = np.random.default_rng(rng)
+    step = FloquetStep(model, n, params, seed)
+    every = tuple(range(n))
+
+    fwd = np.tile(initial_state(n), (trajectories, 1))
+    reached = 0
+    out = np.empty((len(depths), 1 << n))
+    for i in np.argsort(depths, kind="stable"):
+        d = depths[i]
+        for _ in range(d - reached):
+            _noisy_layers(fwd, step.layers, n, noise, rng)
+        reached = d
+
+        psi = fwd.copy()
+        apply_butterfly(psi, n)
+        depolarize(psi, (1,), noise["p1"], n, rng)
+        for _ in range(d):
+            _noisy_layers(psi, step.inverse, n, noise, rng)
+        apply_1q(psi, _H, 0, n)
+        depolarize(psi, (0,), noise["p1"], n, rng)
+        amplitude_damp(psi, every, noise["gamma"], n, rng)
+        out[i] = (np.abs(psi) ** 2).mean(axis=0)
+    return out
+
+
+def noisy_curve(model, n, depths=DEPTHS, params=None, seed=None, noise=None,
+                trajectories=TRAJECTORIES, rng=None):
+    """
+    Noisy C(d) averaged over trajectories, one value per depth.
+
+    C is the read-out probability of 0…0 after the echo, the
+    estimator of the hardware runs.
+    """
+    noise = noise_params(noise)
+    probs = noisy_distribution(model, n, depths, params, seed, noise,
+                               trajectories, rng)
+    return probs @ readout_weights(n, noise["e01"], noise["e10"])
+
+
+def _deep(depths, floor_depth):
+    return [d for d in depths if d >= floor_depth]
+
+
+def predict_floor(n, noise=None, model="kicked_ising", depths=DEPTHS,
+                  floor_depth=FLOOR_DEPTH, trajectories=TRAJECTORIES, rng=None):
+    """⟨C(d ≥ floor_depth)⟩ of the noisy echo."""
+    return noisy_curve(model, n, _deep(depths, floor_depth), noise=noise,
+                       trajectories=trajectories, rng=rng).mean()
+
+
+def fit_error_rates(targets, grid, noise=None, model="kicked_ising",
+                    depths=DEPTHS, floor_depth=FLOOR_DEPTH,
+                    trajectories=TRAJECTORIES, rng=0):
+    """
+    Grid search of the error rates against measured floors.
+
+    targets: {N: floor}; grid: {parameter: candidate values}; the
+    loss is Σ_N ln²(model / measured). Channel rates are simulated
+    once per grid point with the same rng seed (common random
+    numbers, so the loss is smooth in the rates); readout rates
+    only reweight the cached distributions. Returns (best noise
+    dict, loss array shaped like the grid).
+    """
+    base = noise_params(noise)
+    names = list(grid)
+    shape = tuple(len(grid[k]) for k in names)
+    channel = [k for k in names if k not in READOUT]
+    deep = _deep(depths, floor_depth)
+
+    loss = np.empty(shape)
+    sims = {}
+    for idx in itertools.product(*(range(s) for s in shape)):
+        trial = dict(base, **{k: grid[k][i] for k, i in zip(names, idx)})
+        key = tuple(idx[names.index(k)] for k in channel)
+        if key not in sims:
+            sims[key] = {n: noisy_distribution(model, n, deep, noise=trial,
+                                               trajectories=trajectories,
+                                               rng=rng).mean(axis=0)
+                         for n in targets}
+        loss[idx] = sum(
+            np.log(sims[key][n] @ readout_weights(n, trial["e01"], trial["e10"])
+                   / targets[n]) ** 2
+            for n in targets)
+    best = np.unravel_index(np.argmin(loss), shape)
+    return dict(base, **{k: grid[k][i] for k, i in zip(names, best)}), loss
+
+
+def main():
+    from otoc_analysis import analyze, pack_blocks
+    from paper1_data import depths, exact, hardware
+
+    parser = argparse.ArgumentParser(description="Trajectory noise model")
+    parser.add_argument("--trajectories", type=int, default=TRAJECTORIES)
+    parser.add_argument("--p2", type=float, default=NOISE["p2"])
+    parser.add_argument("--e10", type=float, default=NOISE["e10"])
+    parser.add_argument("--fit", action="store_true",
+                        help="fit p2 and e10 to the KI N=8/12 floors")
+    parser.add_argument("--rng", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = (4, 8, 12)
+    res = analyze(pack_blocks([
+        {"label": n, "runs": hardware("kicked_ising", n),
+         "exact": exact("kicked_ising", n), "depths": depths("kicked_ising", n)}
+        for n in sizes]))
+    floors = dict(zip(sizes, res["floor_d6"]))
+
+    noise = noise_params({"p2": args.p2, "e10": args.e10})
+    if args.fit:
+        t0 = time.perf_counter()
+        grid = {"p2": np.geomspace(2e-3, 0.128, 7),
+                "e10": np.linspace(0.0, 0.08, 17)}
+        noise, _ = fit_error_rates({n: floors[n] for n in (8, 12)}, grid,
+                                   noise, trajectories=args.trajectories,
+                                   rng=args.rng)
+        print(f"  Ajuste ({time.perf_counter() - t0:.1f} s): "
+              f"p2 = {noise['p2']:.4f}, e10 = {noise['e10']:.3f}")
+
+    print(f"  {'N':>3} | {'⟨C(d≥6)⟩ IBM':>13} | {'modelo':>10} | "
+          f"{'exacta':>10} | {'1/2^N':>10}")
+    for k, n in enumerate(sizes):
+        pred = predict_floor(n, noise, trajectories=args.trajectories,
+                             rng=args.rng)
+        print(f"  {n:>3} | {floors[n]:>13.6f} | {pred:>10.6f} | "
+              f"{res['floor_exact_d6'][k]:>10.6f} | {1 / 2 ** n:>10.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+============================================================
+NÚCLEO DE ANÁLISIS VECTORIZADO — Ω, MATCH, FLOORS, CORRELACIONES
+============================================================
+Proyecto Kaelion — Paper 1
+
+Packs a ragged set of (model, N) blocks, each a (runs, depths)
+array of measured C(d) plus an optional exact curve, into one
+padded (K, R, D) array with run/depth masks, and computes every
+statistic of paper1_analisis_ibm_v1.py in a single vectorized
+pass over all K blocks:
+
+  mean, std (ddof=1) over runs, Δ = mean − exact,
+  match  |Δ| < 0.03 + 3σ,
+  Ω = ⟨mean⟩_d / C0 and λ = 1 − Ω (measured and exact),
+  floors ⟨C(d ≥ 4)⟩, ⟨C(d ≥ 6)⟩ (measured and exact),
+  Pearson / Spearman of mean vs exact over depths.
+
+Padding is NaN and never enters a statistic; a block with no
+exact curve gets NaN in every exact-dependent field. Cost is
+O(K·R·D) with no Python loop over blocks, so thousands of scan
+configurations go through as fast as the six of the paper.
+============================================================
+"""
+
+import numpy as np
+
+C0 = 0.5
+
+# Criterio de concordancia: |Δ| < MATCH_ABS + MATCH_SIGMA·σ
+MATCH_ABS = 0.03
+MATCH_SIGMA = 3.0
+
+FLOOR_DEPTHS = (4, 6)
+
+# Límites superiores de Ω para cada régimen
+REGIME_EDGES = (0.05, 0.15, 0.35, 0.60)
+REGIMES = ("Scrambling completo", "Scrambling fuerte", "Intermedio",
+           "Scrambling débil", "Sin scrambling")
+
+
+def pack_blocks(blocks):
+    """
+    Pad a list of blocks into masked arrays.
+
+    Each block is a dict with "runs" (R, D) and "depths" (D,), and
+    optionally "label" and "exact" (D,).
+    """
+    k = len(blocks)
+    runs = [np.atleast_2d(np.asarray(b["runs"], dtype=np.float64)) for b in blocks]
+    r_max = max((r.shape[0] for r in runs), default=0)
+    d_max = max((r.shape[1] for r in runs), default=0)
+
+    values = np.full((k, r_max, d_max), np.nan)
+    exact = np.full((k, d_max), np.nan)
+    depths = np.full((k, d_max), -1, dtype=np.int64)
+    for i, (b, r) in enumerate(zip(blocks, runs)):
+        values[i, :r.shape[0], :r.shape[1]] = r
+        depths[i, :r.shape[1]] = b["depths"]
+        if b.get("exact") is not None:
+            exact[i, :r.shape[1]] = b["exact"]
+
+    return {
+        "labels": [b.get("label", str(i)) for i, b in enumerate(blocks)],
+        "values": values,
+        "exact": exact,
+        "depths": depths,
+        "run_mask": ~np.isnan(values).all(axis=2),
+        "depth_mask": depths >= 0,
+    }
+
+
+def _masked_mean(x, mask, axis):
+    n = mask.sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(mask, x, 0.0).sum(axis=axis) / n
+
+
+def _ranks(x, mask):
+    """Average ranks (ties share their mean rank) along the last axis."""
+    d = x.shape[-1]
+    filled = np.where(mask, x, np.inf)
+    order = np.argsort(filled, axis=-1, kind="stable")
+    s = np.take_along_axis(filled, order, axis=-1)
+    pos = np.broadcast_to(np.arange(d), s.shape)
+
+    first = np.ones(s.shape, dtype=bool)
+    first[..., 1:] = s[..., 1:] != s[..., :-1]
+    last = np.ones(s.shape, dtype=bool)
+    last[..., :-1] = first[..., 1:]
+
+    start = np.maximum.accumulate(np.where(first, pos, 0), axis=-1)
+    end = np.flip(np.minimum.accumulate(
+        np.flip(np.where(last, pos, d), axis=-1), axis=-1), axis=-1)
+
+    ranks = np.empty_like(filled)
+    np.put_along_axis(ranks, order, (start + end) / 2.0 + 1.0, axis=-1)
+    return ranks
+
+
+def _pearson(x, y, mask):
+    """Row-wise Pearson r over the masked entries (NaN if undefined)."""
+    mx = _masked_mean(x, mask, -1)[..., None]
+    my = _masked_mean(y, mask, -1)[..., None]
+    dx = np.where(mask, x - mx, 0.0)
+    dy = np.where(mask, y - my, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return ((dx * dy).sum(-1)
+                / np.sqrt((dx * dx).sum(-1) * (dy * dy).sum(-1)))
+
+
+def correlations(x, y, mask):
+    """(pearson, spearman) of x vs y along the last axis."""
+    pearson = _pearson(x, y, mask)
+    spearman = _pearson(_ranks(x, mask), _ranks(y, mask), mask)
+    return pearson, spearman
+
+
+def analyze(packed, c0=C0, match_abs=MATCH_ABS, match_sigma=MATCH_SIGMA,
+            floor_depths=FLOOR_DEPTHS):
+    """All per-block statistics of a pack_blocks() result, as arrays."""
+    values = packed["values"]
+    exact = packed["exact"]
+    depths = packed["depths"]
+    dmask = packed["depth_mask"]
+    cell = packed["run_mask"][:, :, None] & dmask[:, None, :]
+
+    n_runs = packed["run_mask"].sum(axis=1)
+    mean = _masked_mean(values, cell, axis=1)
+    resid = np.where(cell, values - mean[:, None, :], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt((resid ** 2).sum(axis=1) / (n_runs - 1)[:, None])
+    std = np.where(dmask, std, np.nan)
+
+    delta = mean - exact
+    with np.errstate(invalid="ignore"):
+        match = np.abs(delta) < match_abs + match_sigma * std
+
+    omega = _masked_mean(mean, dmask, axis=1) / c0
+    omega_exact = _masked_mean(exact, dmask, axis=1) / c0
+
+    result = {
+        "labels": packed["labels"],
+        "depths": depths,
+        "n_runs": n_runs,
+        "mean": mean,
+        "std": std,
+        "delta": delta,
+        "match": match & dmask & ~np.isnan(delta),
+        "omega": omega,
+        "omega_exact": omega_exact,
+        "lambda": 1.0 - omega,
+        "lambda_exact": 1.0 - omega_exact,
+    }
+    for d in floor_depths:
+        deep = dmask & (depths >= d)
+        result[f"floor_d{d}"] = _masked_mean(mean, deep, axis=1)
+        result[f"floor_exact_d{d}"] = _masked_mean(exact, deep, axis=1)
+
+    both = dmask & ~np.isnan(exact)
+    result["pearson"], result["spearman"] = correlations(mean, exact, both)
+    return result
+
+
+def classify(omega):
+    """Scrambling regime of each Ω (REGIMES, edges REGIME_EDGES)."""
+    idx = np.digitize(np.asarray(omega), REGIME_EDGES)
+    return [REGIMES[i] for i in np.atleast_1d(idx)]
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+============================================================
+DATASET COLUMNAR — C(d) EN COLUMNAS .npy + MANIFIESTO JSON
+============================================================
+Proyecto Kaelion — Paper 1
+
+Compact replacement for the nested {"depth", "C_d"} dicts of
+data/paper1_raw_data.json. A store is a directory:
+
+  manifest.json        categories, parameter dicts, document
+                       skeleton (everything that is not a point)
+  depth.npy, value.npy one row per point (int32 / float64)
+  curve_*.npy          one row per curve: model, n, seed, run,
+                       kind, params, entry, start, stop
+
+Rows are grouped by curve and curves are sorted by
+(model, n, params, seed, run, kind), so selecting by model / N /
+seed is a contiguous range: columns are opened with
+np.load(mmap_mode="r") and a selection is a view of the memmap,
+not a copy. Curves sharing one depth grid reshape to a
+(curves, depths) matrix without copying either.
+
+seed = -1 and run = -1 mean "not applicable". kind is one of
+KINDS: a plain curve, one SYK realization, the disorder average
+mean / std, or the OTOC(2) curve C^(2)(d) stored next to C(d)
+(appended last, so older stores keep their kind codes). Two
+JSON sections are converted: exact_simulation
+(paper1_raw_data.json) and hardware_runs
+(paper1_recovered_ibm_data.json, one curve per run).
+
+The JSON converter is lossless: exporting a converted store
+gives back the same document (same keys, order and floats).
+
+Usage:
+  python code/otoc_dataset.py convert data/paper1_raw_data.json data/paper1_raw_data
+  python code/otoc_dataset.py export data/paper1_raw_data out.json
+  python code/otoc_dataset.py check data/paper1_raw_data.json
+============================================================
+"""
+
+import argparse
+import copy
+import json
+import os
+import tempfile
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+KINDS = ("C_d", "realization", "C_d_mean", "C_d_std", "C2_d")
+
+# Secciones del documento JSON con curvas
+SECTIONS = ("exact_simulation", "hardware_runs")
+
+ROW_COLUMNS = {"depth": np.int32, "value": np.float64}
+
+CURVE_COLUMNS = {
+    "model": np.int16,
+    "n": np.int32,
+    "seed": np.int64,
+    "run": np.int32,
+    "kind": np.int8,
+    "params": np.int32,
+    "entry": np.int32,
+    "start": np.int64,
+    "stop": np.int64,
+}
+
+# Almacén por defecto, convertido desde data/paper1_raw_data.json
+DEFAULT_STORE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "paper1_raw_data")
+
+
+# ============================================================
+# ESCRITURA
+# ============================================================
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def write_store(path, curves, document=None, entries=None):
+    """
+    Write `curves` as a columnar store at `path`.
+
+    Each curve is a dict with model, n, depths, values and optional
+    seed, run, kind, params, entry (index into `entries`).
+    `document` / `entries` carry the JSON skeleton for export.
+    """
+    entries = list(entries or [])
+    models, params_list, params_index = [], [], {}
+    table = {name: [] for name in CURVE_COLUMNS}
+    chunks = []
+
+    for c in curves:
+        if c["model"] not in models:
+            models.append(c["model"])
+        params = c.get("params") or {}
+        key = _params_key(params)
+        if key not in params_index:
+            params_index[key] = len(params_list)
+            params_list.append(params)
+        table["model"].append(models.index(c["model"]))
+        table["n"].append(int(c["n"]))
+        table["seed"].append(-1 if c.get("seed") is None else int(c["seed"]))
+        table["run"].append(-1 if c.get("run") is None else int(c["run"]))
+        table["kind"].append(KINDS.index(c.get("kind", "C_d")))
+        table["params"].append(params_index[key])
+        table["entry"].append(-1 if c.get("entry") is None else int(c["entry"]))
+        chunks.append((np.asarray(c["depths"], dtype=ROW_COLUMNS["depth"]),
+                       np.asarray(c["values"], dtype=ROW_COLUMNS["value"])))
+
+    cols = {k: np.array(v, dtype=CURVE_COLUMNS[k]) for k, v in table.items()
+            if k not in ("start", "stop")}
+    order = np.lexsort((cols["entry"], cols["kind"], cols["run"], cols["seed"],
+                        cols["params"], cols["n"], cols["model"]))
+    cols = {k: v[order] for k, v in cols.items()}
+    chunks = [chunks[i] for i in order]
+
+    lengths = np.array([len(d) for d, _ in chunks], dtype=np.int64)
+    cols["stop"] = np.cumsum(lengths)
+    cols["start"] = cols["stop"] - lengths
+    rows = {
+        "depth": (np.concatenate([d for d, _ in chunks]) if chunks
+                  else np.empty(0, ROW_COLUMNS["depth"])),
+        "value": (np.concatenate([v for _, v in chunks]) if chunks
+                  else np.empty(0, ROW_COLUMNS["value"])),
+    }
+
+    os.makedirs(path, exist_ok=True)
+    columns = {}
+    for prefix, group in (("", rows), ("curve_", cols)):
+        for name, arr in group.items():
+            fname = f"{prefix}{name}.npy"
+            np.save(os.path.join(path, fname), arr)
+            columns[f"{prefix}{name}"] = {"file": fname, "dtype": arr.dtype.str,
+                                          "length": int(len(arr))}
+
+    manifest = {
+        "format": "otoc-columnar",
+        "format_version": FORMAT_VERSION,
+        "n_rows": int(len(rows["value"])),
+        "n_curves": int(len(lengths)),
+        "columns": columns,
+        "models": models,
+        "kinds": list(KINDS),
+        "parameters": params_list,
+        "entries": entries,
+        "document": document,
+    }
+    # El manifiesto se escribe al final: su presencia marca el almacén completo
+    fd, tmp = tempfile.mkstemp(dir=path, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, os.path.join(path, "manifest.json"))
+    return path
+
+
+# ============================================================
+# LECTURA
+# ============================================================
+
+class Selection:
+    """Subset of curves of a store; columns are memmap views when contiguous."""
+
+    def __init__(self, store, curves):
+        self.store = store
+        self.curves = curves
+
+    def __len__(self):
+        return len(self.curves)
+
+    def _rows(self):
+        start = self.store.curve["start"][self.curves]
+        stop = self.store.curve["stop"][self.curves]
+        if len(self.curves) == 0:
+            return slice(0, 0)
+        if np.all(start[1:] == stop[:-1]):
+            return slice(int(start[0]), int(stop[-1]))
+        return np.concatenate([np.arange(a, b) for a, b in zip(start, stop)])
+
+    def __getattr__(self, name):
+        curve = self.__dict__["store"].curve
+        if name in curve:
+            return curve[name][self.__dict__["curves"]]
+        raise AttributeError(name)
+
+    @property
+    def depth(self):
+        return self.store.depth[self._rows()]
+
+    @property
+    def value(self):
+        return self.store.value[self._rows()]
+
+    @property
+    def models(self):
+        return [self.store.models[m] for m in self.model]
+
+    @property
+    def parameters(self):
+        return [self.store.parameters[p] for p in self.params]
+
+    def matrix(self):
+        """(depths, values) with values of shape (curves, depths)."""
+        lengths = self.stop - self.start
+        if len(lengths) == 0:
+            return np.empty(0, ROW_COLUMNS["depth"]), np.empty((0, 0))
+        if np.any(lengths != lengths[0]):
+            raise ValueError("curves have different depth grids")
+        depth = self.depth.reshape(len(lengths), -1)
+        if np.any(depth != depth[0]):
+            raise ValueError("curves have different depth grids")
+        return depth[0], self.value.reshape(len(lengths), -1)
+
+
+class ColumnStore:
+    """Read-only view of a columnar store (columns memory-mapped)."""
+
+    def __init__(self, path, mmap_mode="r"):
+        self.path = path
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != "otoc-columnar":
+            raise ValueError(f"{path} is not an otoc-columnar store")
+        cols = self.manifest["columns"]
+
+        def load(name):
+            arr = np.load(os.path.join(path, cols[name]["file"]),
+                          mmap_mode=mmap_mode)
+            if len(arr) != cols[name]["length"]:
+                raise ValueError(f"{name}: truncated column")
+            return arr
+
+        self.depth = load("depth")
+        self.value = load("value")
+        # La tabla de curvas es pequeña: se carga en memoria
+        self.curve = {k: np.asarray(load(f"curve_{k}")) for k in CURVE_COLUMNS}
+        self.models = self.manifest["models"]
+        self.parameters = self.manifest["parameters"]
+
+    def __len__(self):
+        return self.manifest["n_curves"]
+
+    def select(self, model=None, n=None, seed=None, run=None, kind=None,
+               **params):
+        """Curves matching every given field; params match parameter dicts."""
+        mask = np.ones(len(self), dtype=bool)
+        if model is not None:
+            if model not in self.models:
+                return Selection(self, np.empty(0, dtype=np.int64))
+            mask &= self.curve["model"] == self.models.index(model)
+        for name, wanted in (("n", n), ("seed", seed), ("run", run)):
+            if wanted is not None:
+                mask &= np.isin(self.curve[name], np.atleast_1d(wanted))
+        if kind is not None:
+            kinds = [kind] if isinstance(kind, str) else list(kind)
+            mask &= np.isin(self.curve["kind"], [KINDS.index(k) for k in kinds])
+        if params:
+            ok = [all(p.get(k) == v for k, v in params.items())
+                  for p in self.parameters]
+            mask &= np.asarray(ok, dtype=bool)[self.curve["params"]]
+        return Selection(self, np.flatnonzero(mask))
+
+
+def open_store(path=DEFAULT_STORE, mmap_mode="r"):
+    return ColumnStore(path, mmap_mode)
+
+
+# ============================================================
+# CONVERSIÓN JSON ↔ COLUMNAR
+# ============================================================
+
+def curves_from_document(doc):
+    """(curves, skeleton, entries) for a paper1_raw_data-style dict."""
+    skeleton = copy.deepcopy(doc)
+    curves, entries = [], []
+
+    for section in SECTIONS:
+        for label, entry in skeleton.pop(section, {}).items():
+            idx = len(entries)
+            entries.append({"section": section, "label": label, "entry": entry})
+            base = {"model": entry["model"], "n": entry["n_qubits"],
+                    "params": entry.get("parameters"), "entry": idx}
+
+            if "C_d" in entry:
+                points = entry["C_d"]
+                curves.append(dict(base, seed=entry.get("seed"), kind="C_d",
+                                   depths=[p["depth"] for p in points],
+                                   values=[p["C_d"] for p in points]))
+                entry["C_d"] = None
+
+            if "C2_d" in entry:
+                points = entry["C2_d"]
+                curves.append(dict(base, seed=entry.get("seed"), kind="C2_d",
+                                   depths=[p["depth"] for p in points],
+                                   values=[p["C2_d"] for p in points]))
+                entry["C2_d"] = None
+
+            # Hardware: una curva por run, C_d como lista sobre entry["depths"]
+            for run in entry.get("runs", []):
+                curves.append(dict(base, seed=run.get("seed"), run=run["run"],
+                                   kind="C_d", depths=entry["depths"],
+                                   values=run["C_d"]))
+                run["C_d"] = None
+
+            if "realizations" in entry:
+                for key, points in entry["realizations"].items():
+                    curves.append(dict(base, seed=int(key), kind="realization",
+                                       depths=[p["depth"] for p in points],
+                                       values=[p["C_d"] for p in points]))
+                entry["realizations"] = list(entry["realizations"])
+
+            avg = entry.get("disorder_average", {})
+            if "C_d_mean" in avg:
+                points = avg["C_d_mean"]
+                depths = [p["depth"] for p in points]
+                for kind in ("C_d_mean", "C_d_std"):
+                    curves.append(dict(base, kind=kind, depths=depths,
+                                       values=[p[kind] for p in points]))
+                avg["C_d_mean"] = None
+
+    return curves, skeleton, entries
+
+
+def convert_json(src, dst):
+    """Convert a paper1_raw_data-style JSON file into a store at `dst`."""
+    with open(src) as f:
+        doc = json.load(f)
+    keys = list(doc)
+    curves, skeleton, entries = curves_from_document(doc)
+    skeleton["__keys__"] = keys
+    return write_store(dst, curves, skeleton, entries)
+
+
+def _points(sel, key="C_d"):
+    return [{"depth": int(d), key: float(v)} for d, v in zip(sel.depth, sel.value)]
+
+
+def document_from_store(store):
+    """Rebuild the JSON document a store was converted from."""
+    skeleton = copy.deepcopy(store.manifest["document"] or {})
+    keys = skeleton.pop("__keys__", None)
+    # Curvas agrupadas por entrada una sola vez: cada entrada es un tramo
+    order = np.argsort(store.curve["entry"], kind="stable")
+    bounds = np.searchsorted(store.curve["entry"][order],
+                             np.arange(len(store.manifest["entries"]) + 1))
+
+    for idx, item in enumerate(store.manifest["entries"]):
+        entry = copy.deepcopy(item["entry"])
+        mine = order[bounds[idx]:bounds[idx + 1]]
+
+        def pick(kind, seed=None, run=None):
+            m = store.curve["kind"][mine] == KINDS.index(kind)
+            if seed is not None:
+                m &= store.curve["seed"][mine] == seed
+            if run is not None:
+                m &= store.curve["run"][mine] == run
+            return Selection(store, mine[m])
+
+        if "C_d" in entry and entry["C_d"] is None:
+            entry["C_d"] = _points(pick("C_d"))
+        if "C2_d" in entry and entry["C2_d"] is None:
+            entry["C2_d"] = _points(pick("C2_d"), "C2_d")
+        for run in entry.get("runs", []):
+            if run.get("C_d", 0) is None:
+                sel = pick("C_d", run.get("seed"), run["run"])
+                run["C_d"] = [float(v) for v in sel.value]
+        if isinstance(entry.get("realizations"), list):
+            entry["realizations"] = {
+                key: _points(pick("realization", int(key)))
+                for key in entry["realizations"]}
+        avg = entry.get("disorder_average", {})
+        if "C_d_mean" in avg and avg["C_d_mean"] is None:
+            mean, std = pick("C_d_mean"), pick("C_d_std")
+            avg["C_d_mean"] = [{"depth": int(d), "C_d_mean": float(m),
+                                "C_d_std": float(s)}
+                               for d, m, s in zip(mean.depth, mean.value,
+                                                  std.value)]
+        section = item.get("section", "exact_simulation")
+        skeleton.setdefault(section, {})[item["label"]] = entry
+
+    if keys is None:
+        return skeleton
+    return {k: skeleton[k] for k in keys}
+
+
+def export_json(src, dst):
+    doc = document_from_store(open_store(src))
+    with open(dst, "w") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+
+
+def check_roundtrip(src):
+    """True if JSON → store → JSON reproduces `src` exactly."""
+    with open(src) as f:
+        doc = json.load(f)
+    with tempfile.TemporaryDirectory() as tmp:
+        convert_json(src, tmp)
+        back = document_from_store(open_store(tmp))
+    return json.dumps(doc) == json.dumps(back)
+
+
+def exact_curve(model, n, store=None, **fields):
+    """Exact C(d) of one (model, N) as (depths, float64 values)."""
+    store = open_store() if store is None else store
+    sel = store.select(model, n, kind="C_d", **fields)
+    if len(sel) != 1:
+        raise KeyError(f"{len(sel)} curves match {model} N={n} {fields}")
+    return np.asarray(sel.depth), np.asarray(sel.value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar OTOC dataset store")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("convert", help="JSON → store")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p = sub.add_parser("export", help="store → JSON")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p = sub.add_parser("check", help="lossless round trip of a JSON file")
+    p.add_argument("src")
+    args = parser.parse_args()
+
+    if args.cmd == "convert":
+        convert_json(args.src, args.dst)
+        store = open_store(args.dst)
+        print(f"  {len(store)} curvas, {store.manifest['n_rows']} puntos → {args.dst}")
+    elif args.cmd == "export":
+        export_json(args.src, args.dst)
+        print(f"  → {args.dst}")
+    else:
+        ok = check_roundtrip(args.src)
+        print(f"  Ida y vuelta sin pérdidas: {'✓' if ok else '✗'}")
+        raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
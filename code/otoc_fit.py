@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+============================================================
+AJUSTES POR LOTES — EXPONENCIAL vs LEY DE POTENCIAS
+============================================================
+Proyecto Kaelion — Paper 1
+
+Least-squares fits for a whole (n_curves, n_depths) array of
+C(d) at once:
+
+  exponential   ln C = a − λ_L d        (λ_L of the paper)
+  power law     ln C = a − α ln d
+
+Both are straight lines after the log, so every curve is solved
+with the closed-form 2×2 normal equations from masked sums
+(Σ1, Σx, Σy, Σx², Σxy, Σy²) plus one residual pass; there is no
+loop over curves and a million-curve scan costs a few vectorized
+passes.
+
+A point enters the fit if its depth is inside the fit window and
+C(d) > floor (the floor drops zeros and hardware/numerical noise
+before the log). R² is computed on ln C, as in the paper
+(λ_L = 3.12, R² = 0.973 vs power law R² = 0.926 at N = 20,
+d = 2–10). AIC = n ln(RSS/n) + 2k with k = 2; the model with the
+lower AIC is reported as "best".
+
+The window can also be chosen per curve: search_window fits every
+candidate (d_lo, d_hi) on the depth grid with ≥ min_points points
+as one (windows, curves, depths) batch and keeps, for each row,
+the window with the lowest AIC (long windows that stay straight)
+or the highest R² (the straightest stretch). compare_fits with
+window=None searches the exponential window and fits the power
+law on the same points, so ΔAIC still compares equal data.
+============================================================
+"""
+
+import argparse
+
+import numpy as np
+
+# Ventana de ajuste y piso por defecto (d = 2–10, C > 0)
+FIT_WINDOW = (2, 10)
+FLOOR = 0.0
+MIN_POINTS = 3
+
+N_PARAMS = 2
+
+CRITERIA = ("aic", "r2")
+
+# Elementos (ventanas · curvas · profundidades) por bloque de búsqueda
+SEARCH_CHUNK = 1 << 22
+
+
+def fit_mask(curves, depths, window=FIT_WINDOW, floor=FLOOR):
+    """
+    Points that enter the fit, shape (n_curves, n_depths). The
+    window bounds may be per-row arrays of shape (n_curves,).
+    """
+    d = np.asarray(depths)
+    lo = np.asarray(window[0])[..., None]
+    hi = np.asarray(window[1])[..., None]
+    return (d >= lo) & (d <= hi) & (np.atleast_2d(curves) > floor)
+
+
+def linear_fit(x, y, mask, min_points=2):
+    """
+    Row-wise least squares y = a + b x over the masked points.
+
+    x broadcasts against y (e.g. (D,) against (K, D)). Returns arrays
+    of shape (K,): slope, intercept, slope_se, n, rss, r2, aic.
+    Rows with fewer than `min_points` points are NaN.
+    """
+    w = mask.astype(np.float64)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+
+    n = w.sum(axis=-1)
+    sx = x.sum(axis=-1)
+    sy = y.sum(axis=-1)
+    sxx = (x * x).sum(axis=-1)
+    sxy = (x * y).sum(axis=-1)
+    syy = (y * y).sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cxx = sxx - sx * sx / n
+        cxy = sxy - sx * sy / n
+        cyy = syy - sy * sy / n
+        slope = cxy / cxx
+        intercept = (sy - slope * sx) / n
+        resid = np.where(mask, y - intercept[..., None] - slope[..., None] * x, 0.0)
+        rss = (resid * resid).sum(axis=-1)
+        r2 = 1.0 - rss / cyy
+        slope_se = np.sqrt(rss / (n - 2) / cxx)
+        aic = n * np.log(rss / n) + 2 * N_PARAMS
+
+    ok = n >= max(min_points, 2)
+    nan = np.nan
+    return {
+        "slope": np.where(ok, slope, nan),
+        "intercept": np.where(ok, intercept, nan),
+        "slope_se": np.where(ok & (n > 2), slope_se, nan),
+        "n": n.astype(np.int64),
+        "rss": np.where(ok, rss, nan),
+        "r2": np.where(ok, r2, nan),
+        "aic": np.where(ok, aic, nan),
+    }
+
+
+def _log(curves, mask):
+    return np.log(np.where(mask, curves, 1.0))
+
+
+def fit_exponential(curves, depths, window=FIT_WINDOW, floor=FLOOR,
+                    min_points=MIN_POINTS):
+    """ln C = a − λ_L d for every curve."""
+    curves = np.atleast_2d(np.asarray(curves, dtype=np.float64))
+    mask = fit_mask(curves, depths, window, floor)
+    fit = linear_fit(np.asarray(depths, dtype=np.float64), _log(curves, mask),
+                     mask, min_points)
+    fit["lambda_L"] = -fit["slope"]
+    fit["lambda_L_se"] = fit["slope_se"]
+    fit["amplitude"] = np.exp(fit["intercept"])
+    return fit
+
+
+def fit_power_law(curves, depths, window=FIT_WINDOW, floor=FLOOR,
+                  min_points=MIN_POINTS):
+    """ln C = a − α ln d for every curve (depths ≥ 1)."""
+    curves = np.atleast_2d(np.asarray(curves, dtype=np.float64))
+    d = np.asarray(depths, dtype=np.float64)
+    mask = fit_mask(curves, depths, window, floor) & (d > 0)
+    with np.errstate(divide="ignore"):
+        logd = np.log(np.where(d > 0, d, 1.0))
+    fit = linear_fit(logd, _log(curves, mask), mask, min_points)
+    fit["alpha"] = -fit["slope"]
+    fit["alpha_se"] = fit["slope_se"]
+    fit["amplitude"] = np.exp(fit["intercept"])
+    return fit
+
+
+def candidate_windows(depths, min_points=MIN_POINTS):
+    """(W, 2) windows (d_lo, d_hi) of the grid holding ≥ min_points depths."""
+    d = np.unique(np.asarray(depths))
+    i, j = np.triu_indices(len(d), k=max(min_points, 2) - 1)
+    return np.stack([d[i], d[j]], axis=1)
+
+
+def search_window(curves, depths, model="exp", criterion="aic", floor=FLOOR,
+                  min_points=MIN_POINTS, windows=None):
+    """
+    Best fit window per curve: the linear_fit arrays of the chosen
+    window plus d_lo, d_hi (NaN where no window has enough points).
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"criterion must be one of {CRITERIA}")
+    curves = np.atleast_2d(np.asarray(curves, dtype=np.float64))
+    d = np.asarray(depths, dtype=np.float64)
+    if windows is None:
+        windows = candidate_windows(depths, min_points)
+    windows = np.asarray(windows, dtype=np.float64)
+    if model == "exp":
+        x, valid = d, np.ones(len(d), dtype=bool)
+    elif model == "pow":
+        valid = d > 0
+        x = np.log(np.where(valid, d, 1.0))
+    else:
+        raise ValueError("model must be 'exp' or 'pow'")
+    in_window = ((d >= windows[:, :1]) & (d <= windows[:, 1:]) & valid)[:, None]
+
+    k, w = len(curves), len(windows)
+    chunk = max(1, SEARCH_CHUNK // max(w * len(d), 1))
+    out = None
+    for c0 in range(0, k, chunk):
+        block = curves[c0:c0 + chunk]
+        mask = in_window & (block > floor)
+        fit = linear_fit(x, _log(block, mask), mask, min_points)
+        score = fit["aic"] if criterion == "aic" else -fit["r2"]
+        score = np.where(np.isnan(score), np.inf, score)
+        best = np.argmin(score, axis=0)
+        found = np.isfinite(score[best, np.arange(len(block))])
+        pick = {key: np.take_along_axis(v, best[None], axis=0)[0]
+                for key, v in fit.items()}
+        pick["d_lo"] = np.where(found, windows[best, 0], np.nan)
+        pick["d_hi"] = np.where(found, windows[best, 1], np.nan)
+        if out is None:
+            out = {key: np.empty(k, dtype=v.dtype) for key, v in pick.items()}
+        for key, v in pick.items():
+            out[key][c0:c0 + chunk] = v
+    if model == "exp":
+        out["lambda_L"] = -out["slope"]
+        out["lambda_L_se"] = out["slope_se"]
+    else:
+        out["alpha"] = -out["slope"]
+        out["alpha_se"] = out["slope_se"]
+    out["amplitude"] = np.exp(out["intercept"])
+    return out
+
+
+def compare_fits(curves, depths, window=FIT_WINDOW, floor=FLOOR,
+                 min_points=MIN_POINTS, criterion="aic"):
+    """
+    Both fits plus the AIC choice per curve ("exp" / "pow"). With
+    window=None the exponential window of each row is searched by
+    `criterion` (search_window) and reused for the power law; the
+    chosen window is returned as a (n_curves, 2) array.
+    """
+    if window is None:
+        exp = search_window(curves, depths, "exp", criterion, floor, min_points)
+        window = (exp["d_lo"], exp["d_hi"])
+    else:
+        exp = fit_exponential(curves, depths, window, floor, min_points)
+    pow_ = fit_power_law(curves, depths, window, floor, min_points)
+    delta = exp["aic"] - pow_["aic"]
+    best = np.where(np.isnan(delta), "", np.where(delta <= 0, "exp", "pow"))
+    rows = len(delta)
+    chosen = np.stack([np.broadcast_to(np.asarray(window[0], dtype=np.float64), rows),
+                       np.broadcast_to(np.asarray(window[1], dtype=np.float64), rows)],
+                      axis=1)
+    return {"exp": exp, "pow": pow_, "delta_aic": delta, "best": best,
+            "window": chosen}
+
+
+def main():
+    from paper1_data import depths, exact
+    from otoc_dataset import open_store
+
+    parser = argparse.ArgumentParser(description="Batched exp / power-law fits")
+    parser.add_argument("--window", type=int, nargs=2, default=FIT_WINDOW)
+    parser.add_argument("--floor", type=float, default=FLOOR)
+    parser.add_argument("--search", choices=CRITERIA, default=None,
+                        help="search the window per curve by this criterion")
+    parser.add_argument("--min-points", type=int, default=MIN_POINTS)
+    args = parser.parse_args()
+    window = None if args.search else tuple(args.window)
+
+    if window is None:
+        print(f"  Ventana por curva ({args.search}, ≥ {args.min_points} puntos), "
+              f"piso C > {args.floor:g}")
+    else:
+        print(f"  Ventana d = {window[0]}–{window[1]}, piso C > {args.floor:g}")
+    print(f"  {'Curva':<10} | {'d':>7} | {'λ_L':>14} | {'R²_exp':>7} | "
+          f"{'R²_pow':>7} | {'ΔAIC':>7} | Mejor")
+    for n in (4, 8, 12, 20):
+        f = compare_fits(exact("kicked_ising", n), depths("kicked_ising", n),
+                         window, args.floor, args.min_points, args.search or "aic")
+        e, p = f["exp"], f["pow"]
+        lo, hi = f["window"][0]
+        print(f"  {f'KI N={n}':<10} | {lo:>3.0f}–{hi:<3.0f} | {e['lambda_L'][0]:>6.3f} ± "
+              f"{e['lambda_L_se'][0]:<5.3f} | {e['r2'][0]:>7.3f} | "
+              f"{p['r2'][0]:>7.3f} | {f['delta_aic'][0]:>+7.2f} | {f['best'][0]}")
+
+    d, curves = open_store().select("syk_simplified", 4,
+                                    kind="realization").matrix()
+    f = compare_fits(curves, d, window, args.floor, args.min_points,
+                     args.search or "aic")
+    r2 = f["exp"]["r2"]
+    print(f"\n  SYK N=4, {len(curves)} seeds: mediana R²_exp = "
+          f"{np.nanmedian(r2):.2f}, media = {np.nanmean(r2):.2f}, "
+          f"R² > 0.9: {int(np.sum(r2 > 0.9))}/{len(curves)}, "
+          f"mejor exp/pow: {int(np.sum(f['best'] == 'exp'))}/"
+          f"{int(np.sum(f['best'] == 'pow'))}")
+
+
+if __name__ == "__main__":
+    main()
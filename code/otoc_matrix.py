@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+============================================================
+MATRIZ OTOC C_ij(d) — TODOS LOS SITIOS Y VELOCIDAD DE MARIPOSA
+============================================================
+Proyecto Kaelion — Paper 1
+
+The paper's echo fixes the probe on qubit 0 (X_0 preparation,
+H_0 readout) and the butterfly on qubit 1. The matrix mode gives
+
+  C_ij(d) = |⟨0…0| H_j U^{-d} Z_i U^d X_j |0…0⟩|²
+          = |⟨χ^j_d| Z_i |ψ^j_d⟩|²,   ψ^j_0 = X_j|0⟩, χ^j_0 = H_j|0⟩,
+
+so C_10(d) is the paper's C(d). As in otoc_sweep, nothing is
+evolved backwards: for every probe column j the two forward
+states are carried across the depth grid as stacked
+(columns, 2^N) arrays, and every butterfly site i is one masked
+sum of v = χ* ψ, i.e. all N rows of a column come from the same
+states.
+
+Light cone. With the probe j outside the support of
+W_i(d) = U^{-d} Z_i U^d, X_j commutes with W_i and
+
+  C_ij(d) = B_i(d) = |⟨0…0|W_i(d)|0…0⟩|² / 2,
+
+independent of j (the all-zero projection makes C decay even far
+from the probe, so C itself shows no front). B_i(d) is one more
+forward state, φ_d = U^d|0…0⟩, and the map is
+
+  Δ_ij(d) = |C_ij(d) − B_i(d)| / C0,
+
+exactly zero (to rounding) outside the cone.
+
+Translation invariance cuts the columns: C_ij depends only on
+i − j (mod the period) when the step is invariant under a shift
+by `period` sites, so only `period` columns are evolved:
+
+  kicked_ising (periodic)  period 1: the paper's own two states
+  floquet (N even)         period 2 (CZ on the odd bonds)
+  otherwise                every column
+
+The front r*(d) is the largest ring distance |i − j| with
+Δ_ij(d) > eps · max Δ(d) (relative: C drops by orders of
+magnitude with d, while Δ outside the cone stays at rounding
+level), and v_B is the slope of r*(d)
+(otoc_fit.linear_fit) over the depths before the front first
+reaches N/2.
+============================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from otoc_analysis import C0
+from otoc_engine import DEPTHS, FloquetStep, model_params
+from otoc_fit import linear_fit
+
+# Umbral relativo de Δ_ij (frente a max Δ a esa profundidad)
+FRONT_EPS = 1e-3
+
+# Δ por debajo de este valor es redondeo (d = 0, fuera del cono)
+FRONT_FLOOR = 1e-13
+
+
+def translation_period(model, n, params=None):
+    """Shift (sites) that leaves one Floquet step invariant."""
+    p = model_params(model, params)
+    if model == "kicked_ising" and p.get("boundary") == "periodic":
+        return 1
+    if model == "floquet" and n % 2 == 0:
+        return 2
+    return n
+
+
+def probe_states(n, columns):
+    """Stacked X_j|0…0⟩ and H_j|0…0⟩ for the probe sites `columns`."""
+    psi = np.zeros((len(columns), 1 << n), dtype=complex)
+    chi = np.zeros_like(psi)
+    for k, j in enumerate(columns):
+        psi[k, 1 << (n - 1 - j)] = 1.0
+        chi[k, 0] = chi[k, 1 << (n - 1 - j)] = 1 / np.sqrt(2)
+    return psi, chi
+
+
+def butterfly_overlaps(chi, psi, n):
+    """⟨chi_k|Z_i|psi_k⟩ for every row k and site i, shape (K, N)."""
+    v = chi.conj() * psi
+    total = v.sum(axis=-1)
+    out = np.empty((len(v), n), dtype=complex)
+    for i in range(n):
+        ones = v.reshape(len(v), 1 << i, 2, -1)[:, :, 1, :].sum(axis=(1, 2))
+        out[:, i] = total - 2 * ones
+    return out
+
+
+def otoc_matrix(model, n, depths=DEPTHS, params=None, seed=None, period=None):
+    """
+    (C[d, i, j], B[d, i]) for butterfly site i and probe site j,
+    with B the value of C for a probe outside the light cone.
+    """
+    if period is None:
+        period = translation_period(model, n, params)
+    step = FloquetStep(model, n, params, seed)
+    columns = list(range(period))
+    psi, chi = probe_states(n, columns)
+    phi = np.zeros((1, 1 << n), dtype=complex)
+    phi[0, 0] = 1.0
+
+    values = {}
+    d = 0
+    for target in sorted(set(depths)):
+        step.forward(psi, target - d)
+        step.forward(chi, target - d)
+        step.forward(phi, target - d)
+        d = target
+        cols = np.abs(butterfly_overlaps(chi, psi, n)) ** 2
+        base = np.abs(butterfly_overlaps(phi, phi, n)[0]) ** 2 / 2
+        # Columna j = c + m·period: C_ij = C_{i − m·period, c}
+        mat = np.empty((n, n))
+        for j in range(n):
+            c, shift = j % period, j - j % period
+            mat[:, j] = np.roll(cols[c], shift)
+        values[d] = mat, base
+    return (np.stack([values[d][0] for d in depths]),
+            np.stack([values[d][1] for d in depths]))
+
+
+def ring_distance(n):
+    """|i − j| on the periodic chain, shape (N, N)."""
+    i = np.arange(n)
+    r = np.abs(i[:, None] - i[None, :])
+    return np.minimum(r, n - r)
+
+
+def light_cone_map(cmat, base, c0=C0):
+    """Δ[d, i, j] = |C_ij(d) − B_i(d)| / C0."""
+    return np.abs(cmat - base[..., :, None]) / c0
+
+
+def light_cone_front(delta, eps=FRONT_EPS, floor=FRONT_FLOOR):
+    """r*(d): largest ring distance with Δ_ij > eps·max Δ (−1 if none)."""
+    r = ring_distance(delta.shape[-1])
+    scale = delta.max(axis=(-2, -1), keepdims=True)
+    hit = delta > np.maximum(eps * scale, floor)
+    return np.where(hit, r, -1).max(axis=(-2, -1))
+
+
+def butterfly_velocity(depths, front, n):
+    """v_B (sites per step) and its error from r*(d) before wrapping."""
+    depths = np.asarray(depths, dtype=np.float64)
+    front = np.asarray(front, dtype=np.float64)
+    # Solo hasta que el frente alcanza la mitad del anillo
+    wrapped = np.flatnonzero(front >= n // 2)
+    mask = front >= 0
+    if wrapped.size:
+        mask &= depths < depths[wrapped[0]]
+    fit = linear_fit(depths, front[None, :], mask[None, :])
+    return float(fit["slope"][0]), float(fit["slope_se"][0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OTOC matrix C_ij(d) and v_B")
+    parser.add_argument("--model", default="kicked_ising")
+    parser.add_argument("--n", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--eps", type=float, default=FRONT_EPS)
+    parser.add_argument("--check", action="store_true",
+                        help="compare with every column evolved and with otoc_sweep")
+    args = parser.parse_args()
+
+    depths = list(range(0, max(DEPTHS) + 1))
+    t0 = time.perf_counter()
+    cmat, base = otoc_matrix(args.model, args.n, depths, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    delta = light_cone_map(cmat, base)
+    front = light_cone_front(delta, args.eps)
+    v, v_err = butterfly_velocity(depths, front, args.n)
+
+    period = translation_period(args.model, args.n)
+    print(f"{args.model} N={args.n}: {period} columna(s) evolucionada(s) "
+          f"({elapsed:.2f} s)")
+    r = ring_distance(args.n)
+    dist = range(args.n // 2 + 1)
+    print("  Δ = |C_ij − B_i| / C0 por distancia |i − j| (máx. sobre pares):")
+    print("  d   " + "".join(f"{k:>8}" for k in dist) + "   r*")
+    for d, mat, f in zip(depths, delta, front):
+        row = [mat[r == k].max() for k in dist]
+        print(f"  {d:>2}  " + "".join(f"{x:8.1e}" for x in row) + f"  {f:>3}")
+    print(f"  v_B = {v:.3f} ± {v_err:.3f} sitios/paso (ε = {args.eps:g})")
+
+    if args.check:
+        from otoc_engine import otoc_sweep
+        full, _ = otoc_matrix(args.model, args.n, depths, seed=args.seed,
+                              period=args.n)
+        curve = otoc_sweep(FloquetStep(args.model, args.n, seed=args.seed),
+                           depths)
+        print(f"  max |simetría − todas las columnas| = "
+              f"{np.abs(cmat - full).max():.2e}")
+        print(f"  max |C_10 − otoc_sweep| = {np.abs(cmat[:, 1, 0] - curve).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
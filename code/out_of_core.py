@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+============================================================
+STATEVECTOR FUERA DE MEMORIA — numpy.memmap PARA N = 30–32
+============================================================
+Proyecto Kaelion — Paper 1
+
+At N = 30 one complex128 state is 16 GB and the echo sweep
+carries two (ψ_d and χ_d), so each state lives in a memmap file
+(complex64 by default: 8 GB at N = 30, 32 GB at N = 32) seen as
+2^h rows × 2^c amplitudes, where the c = chunk_qubits low qubits
+index inside a row and the h = N − c high qubits pick the row.
+
+One Floquet step of kicked_ising / floquet is two blocked passes
+over the file; one-qubit gates on different qubits commute, so:
+
+  pass 1  column windows rows[:, w0:w0+w] (2^h contiguous
+          segments, w = 2^c / 2^h): the transposed block holds
+          every high qubit locally, so all rotations of the high
+          qubits are applied in RAM and written back.
+  pass 2  whole rows, in place: rotations of the low qubits and
+          the diagonal ZZ (+ CZ) phase, whose codes are rebuilt
+          per row from a precomputed low-qubit part, a per-row
+          constant and the bonds that cross the split, so no
+          2^N code array is ever built.
+
+Each block is upcast to complex128 in RAM (gates through the
+active otoc_engine.KERNELS, so kernels.set_backend("numba")
+applies) and written back in the storage dtype; C(d) is a
+complex128 sum of per-row overlaps. complex64 storage rounds every
+amplitude once per pass: the absolute error of C(d) stays ≲ 4e-8
+(measured at d ≤ 14), which is ≲ 1.4e-6 relative above the floor
+1/2^N but meaningless below it, so curves near the floor need
+complex128 storage (see STORAGE). After every block its pages
+are released from the mapping (madvise), so the resident set
+is a few blocks whatever N (< 1 GB at chunk_qubits = 24).
+
+out_of_core_curve() reports per Floquet step the wall time,
+bytes moved (read + written, both states), the I/O throughput
+and the peak RSS of the process. Scratch files go to
+$OTOC_SCRATCH_DIR (default: the system temp dir) and are removed
+at the end.
+============================================================
+"""
+
+import argparse
+import mmap
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+import otoc_engine
+from otoc_engine import (DEPTHS, diagonal_bonds, ising_table, model_params,
+                         rotation_gates)
+
+OOC_MODELS = ("kicked_ising", "floquet")
+
+# Qubits locales por fila (2^24 amplitudes = 256 MB en complex128 en RAM)
+CHUNK_QUBITS = 24
+
+# complex64 por defecto. Error medido contra otoc_sweep (d ≤ 14, N = 8–18):
+# absoluto ≲ 4e-8 en C(d); relativo ≲ 1.4e-6 mientras C > 1/2^N, pero sin
+# cota bajo ese floor (1.3e-3 con C ≈ 3e-12 a N = 16). A N = 30 el floor
+# (9e-10) queda por debajo del error absoluto: --complex128 para C cerca
+# del floor.
+STORAGE = np.complex64
+
+SCRATCH_DIR = os.environ.get("OTOC_SCRATCH_DIR", tempfile.gettempdir())
+
+
+def _bits(n, q):
+    """Bit of qubit q for the 2^n indices (uint8), without an int64 index."""
+    bits = np.zeros((1 << q, 2, 1 << (n - 1 - q)), dtype=np.uint8)
+    bits[:, 1] = 1
+    return bits.reshape(-1)
+
+
+def _walls(n, pairs):
+    """Anti-aligned pairs per index (int16), like domain_walls."""
+    walls = np.zeros(1 << n, dtype=np.int16)
+    for i, j in pairs:
+        walls += _bits(n, i) ^ _bits(n, j)
+    return walls
+
+
+def _peak_rss():
+    """Peak resident set size of the process in bytes (Linux: KB units)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class DiskState:
+    """2^N amplitudes in a memmap file, viewed as (2^h, 2^c) rows."""
+
+    def __init__(self, n, chunk_qubits=CHUNK_QUBITS, dtype=STORAGE,
+                 directory=SCRATCH_DIR):
+        self.n = n
+        self.c = min(chunk_qubits, n - 2)
+        self.h = n - self.c
+        if self.h > self.c:
+            raise ValueError(f"N={n} needs chunk_qubits >= {(n + 1) // 2}")
+        fd, self.path = tempfile.mkstemp(suffix=".amp", dir=directory)
+        os.close(fd)
+        # Archivo disperso: las páginas sin escribir se leen como ceros
+        self.data = np.memmap(self.path, dtype=dtype, mode="w+",
+                              shape=(1 << self.h, 1 << self.c))
+        self.moved = 0
+
+    def set_amplitudes(self, amps):
+        """Write {basis index: amplitude} into the (all-zero) state."""
+        for x, a in amps.items():
+            self.data[x >> self.c, x & ((1 << self.c) - 1)] = a
+
+    def read(self, rows, cols=slice(None), out=None):
+        """Block upcast to complex128 (into `out` when given)."""
+        if out is None:
+            out = np.empty(self.data[rows, cols].shape, dtype=complex)
+        np.copyto(out, self.data[rows, cols])
+        self.moved += out.size * self.data.itemsize
+        return out
+
+    def write(self, rows, cols, block):
+        self.data[rows, cols] = block
+        self.moved += block.size * self.data.itemsize
+        self.release()
+
+    def release(self):
+        """Drop the mapped pages from the resident set (data stay on disk)."""
+        raw = getattr(self.data, "_mmap", None)
+        if raw is not None and hasattr(raw, "madvise"):
+            raw.madvise(mmap.MADV_DONTNEED)
+
+    def close(self):
+        del self.data
+        os.remove(self.path)
+
+
+class OutOfCoreStep:
+    """Floquet step of kicked_ising / floquet as two blocked passes."""
+
+    def __init__(self, model, n, params=None, chunk_qubits=CHUNK_QUBITS):
+        if model not in OOC_MODELS:
+            raise ValueError(f"out-of-core mode covers {OOC_MODELS}")
+        self.model = model
+        self.n = n
+        self.params = model_params(model, params)
+        self.c = min(chunk_qubits, n - 2)
+        self.h = n - self.c
+        self.rotations = rotation_gates(model, params)
+        bonds, cz_pairs = diagonal_bonds(model, n, params)
+        h, c = self.h, self.c
+
+        # Tabla de fases de ising_layer: código = paredes + nb·cz
+        self.nb = len(bonds) + 1
+        self.table = ising_table(len(bonds), self.params["J"], bool(cz_pairs))
+
+        def split(pairs):
+            low, high, cross = [], [], []
+            for i, j in pairs:
+                if i >= h and j >= h:
+                    low.append((i - h, j - h))
+                elif i < h and j < h:
+                    high.append((i, j))
+                else:
+                    hq, lq = (i, j - h) if i < h else (j, i - h)
+                    cross.append((hq, lq))
+            return low, high, cross
+
+        low, high, self.cross = split(bonds)
+        self.low_walls = _walls(c, low)
+        self.high_walls = _walls(h, high)
+        self.cross_bits = [_bits(c, lq) for _, lq in self.cross]
+
+        low, high, self.cross_cz = split(cz_pairs)
+        self.low_cz = np.zeros(1 << c, dtype=np.uint8)
+        for i, j in low:
+            self.low_cz ^= _bits(c, i) & _bits(c, j)
+        self.high_cz = np.zeros(1 << h, dtype=np.uint8)
+        for i, j in high:
+            self.high_cz ^= _bits(h, i) & _bits(h, j)
+        self.cross_cz_bits = [_bits(c, lq) for _, lq in self.cross_cz]
+
+    def _row_bit(self, row, q):
+        return (row >> (self.h - 1 - q)) & 1
+
+    def row_codes(self, row):
+        """Phase-table codes of the 2^c amplitudes of one row."""
+        walls = self.low_walls + self.high_walls[row]
+        for (hq, _), bits in zip(self.cross, self.cross_bits):
+            walls += bits ^ self._row_bit(row, hq)
+        if self.table.size == self.nb:
+            return walls
+        cz = self.low_cz ^ self.high_cz[row]
+        for (hq, _), bits in zip(self.cross_cz, self.cross_cz_bits):
+            if self._row_bit(row, hq):
+                cz = cz ^ bits
+        return walls + self.nb * cz
+
+    def forward(self, state):
+        """One Floquet step on a DiskState, in place."""
+        h, c = self.h, self.c
+        apply_1q = otoc_engine.KERNELS["1q"]
+        width = 1 << (c - h)
+        # Un solo búfer de 2^c amplitudes para las dos pasadas
+        x = np.empty(1 << c, dtype=complex)
+        block = x.reshape(1 << h, width)
+        for w0 in range(0, 1 << c, width):
+            state.read(slice(None), slice(w0, w0 + width), block)
+            for gate in self.rotations:
+                for q in range(h):
+                    apply_1q(block, gate, q, c)
+            state.write(slice(None), slice(w0, w0 + width), block)
+        for row in range(1 << h):
+            state.read(row, slice(None), x)
+            for gate in self.rotations:
+                for q in range(c):
+                    apply_1q(x, gate, q, c)
+            otoc_engine.KERNELS["diag"](x, self.row_codes(row), self.table)
+            state.write(row, slice(None), x)
+        return state
+
+
+def disk_overlap(chi, psi):
+    """⟨chi|Z_1|psi⟩ accumulated in complex128 row by row."""
+    total = 0j
+    a = np.empty(1 << psi.c, dtype=complex)
+    b = np.empty_like(a)
+    for row in range(1 << psi.h):
+        sign = -1.0 if (row >> (psi.h - 2)) & 1 else 1.0
+        total += sign * np.vdot(chi.read(row, out=a), psi.read(row, out=b))
+        psi.release()
+        chi.release()
+    return total
+
+
+def out_of_core_curve(model, n, depths=DEPTHS, params=None,
+                      chunk_qubits=CHUNK_QUBITS, dtype=STORAGE,
+                      directory=SCRATCH_DIR):
+    """
+    C(d) for `depths` with both echo states on disk, plus a report
+    per Floquet step: seconds, bytes moved, bytes/s and peak RSS.
+    """
+    step = OutOfCoreStep(model, n, params, chunk_qubits)
+    psi = DiskState(n, chunk_qubits, dtype, directory)
+    chi = DiskState(n, chunk_qubits, dtype, directory)
+    top = 1 << (n - 1)
+    psi.set_amplitudes({top: 1.0})
+    chi.set_amplitudes({0: 1 / np.sqrt(2), top: 1 / np.sqrt(2)})
+
+    report = {"seconds": [], "bytes": [], "throughput": [], "peak_rss": []}
+    values = {}
+    try:
+        d = 0
+        for target in sorted(set(depths)):
+            while d < target:
+                t0 = time.perf_counter()
+                moved = psi.moved + chi.moved
+                step.forward(psi)
+                step.forward(chi)
+                psi.data.flush()
+                chi.data.flush()
+                elapsed = time.perf_counter() - t0
+                moved = psi.moved + chi.moved - moved
+                report["seconds"].append(elapsed)
+                report["bytes"].append(moved)
+                report["throughput"].append(moved / elapsed)
+                report["peak_rss"].append(_peak_rss())
+                d += 1
+            values[d] = abs(disk_overlap(chi, psi)) ** 2
+    finally:
+        psi.close()
+        chi.close()
+    return (np.array([values[d] for d in depths]),
+            {k: np.array(v) for k, v in report.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core OTOC C(d)")
+    parser.add_argument("--model", default="kicked_ising", choices=OOC_MODELS)
+    parser.add_argument("--n", type=int, default=30)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--chunk-qubits", type=int, default=CHUNK_QUBITS)
+    parser.add_argument("--complex128", action="store_true",
+                        help="store complex128 instead of complex64")
+    parser.add_argument("--kernels", default="numpy",
+                        choices=("numpy", "threads", "numba"))
+    parser.add_argument("--check", action="store_true",
+                        help="compare against the in-memory engine")
+    args = parser.parse_args()
+
+    from kernels import set_backend
+    set_backend(args.kernels)
+    dtype = np.complex128 if args.complex128 else STORAGE
+    gb = (1 << args.n) * np.dtype(dtype).itemsize / 1024 ** 3
+    print(f"{args.model} N={args.n}: 2 estados × {gb:.2f} GB en {SCRATCH_DIR} "
+          f"({np.dtype(dtype).name}, filas de 2^{min(args.chunk_qubits, args.n - 2)})")
+
+    curve, report = out_of_core_curve(args.model, args.n, args.depths,
+                                      chunk_qubits=args.chunk_qubits,
+                                      dtype=dtype)
+    for k, (t, b, tp, rss) in enumerate(zip(report["seconds"], report["bytes"],
+                                            report["throughput"],
+                                            report["peak_rss"]), 1):
+        print(f"  paso {k:>2}: {t:8.2f} s  E/S {b / 1024 ** 3:7.2f} GB "
+              f"({tp / 1024 ** 2:7.1f} MB/s)  RSS pico {rss / 1024 ** 3:.2f} GB")
+    for d, c in zip(args.depths, curve):
+        print(f"  d={d:>2}  C={c:.6e}")
+
+    if args.check:
+        from otoc_engine import FloquetStep, otoc_sweep
+        exact = otoc_sweep(FloquetStep(args.model, args.n), args.depths)
+        err = np.abs(curve - exact)
+        above = exact > 1.0 / 2 ** args.n
+        print(f"  max |disco − memoria| = {err.max():.2e}")
+        if above.any():
+            print(f"  max error relativo con C > 1/2^N = "
+                  f"{(err[above] / exact[above]).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,168 +13,58 @@ del log de ejecución, y compara con la simulación exacta.
 
 import numpy as np
 
-# ============================================================
-# MAPEO DE JOB IDs A MODELOS (del log de ejecución)
-# ============================================================
-
-DEPTHS = [1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 14]
-
-# Job IDs en orden de ejecución (del log)
-JOB_MAP = {
-    "kicked_ising_N4": {
-        "runs": [
-            "d689mbpv6o8c73d6f1i0",  # Run 1
-            "d689muje4kfs73d2rgeg",  # Run 2
-            "d689n3re4kfs73d2rglg",  # Run 3
-            "d689n93e4kfs73d2rgrg",  # Run 4
-            "d689ne8qbmes739ga320",  # Run 5
-        ]
-    },
-    "kicked_ising_N8": {
-        "runs": [
-            "d689njre4kfs73d2rh60",
-            "d689ns0qbmes739ga3ig",
-            "d689o25bujdc73d0rl50",
-            "d689oa9v6o8c73d6f3u0",
-            "d689og9v6o8c73d6f48g",
-        ]
-    },
-    "kicked_ising_N12": {
-        "runs": [
-            "d689olre4kfs73d2ridg",
-            "d689ordbujdc73d0rm50",
-            "d689p0je4kfs73d2riqg",
-            "d689p61v6o8c73d6f54g",
-            "d689pfoqbmes739ga5e0",
-        ]
-    },
-    "kicked_ising_N20": {
-        "runs": [
-            "d689plpv6o8c73d6f5pg",
-            "d689ps1v6o8c73d6f63g",
-            "d689qchv6o8c73d6f6q0",
-            "d689qj3e4kfs73d2rkv0",
-            "d689qp9v6o8c73d6f7bg",
-        ]
-    },
-    "integrable_N4": {
-        "runs": [
-            "d689qupv6o8c73d6f7kg",
-            "d689r3pv6o8c73d6f7r0",
-            "d689r88qbmes739ga7lg",
-            "d689rd1v6o8c73d6f87g",
-            "d689rm1v6o8c73d6f8kg",
-        ]
-    },
-    "floquet_N4": {
-        "runs": [
-            "d689rr1v6o8c73d6f8t0",
-            "d689s38qbmes739ga8k0",
-            "d689s8gqbmes739ga8r0",
-            "d689sdoqbmes739ga910",
-            "d689smtbujdc73d0rr2g",
-        ]
-    },
-    "syk_N4": {
-        "seeds_and_jobs": [
-            (1000, "d689ss0qbmes739ga9i0"),
-            (1137, "d689t48qbmes739ga9s0"),
-            (1274, "d689tdre4kfs73d2rog0"),
-            (1411, "d689tj5bujdc73d0rs70"),
-            (1548, "d689togqbmes739gaakg"),
-            (1685, "d689u1hv6o8c73d6fbqg"),
-            (1822, "d689u7be4kfs73d2rpi0"),
-            (1959, "d689ucpv6o8c73d6fc80"),
-            (2096, "d689ui1v6o8c73d6fcf0"),
-        ]
-    }
-}
+from mitigation import READOUT, mitigate_blocks
+from otoc_analysis import analyze, classify, pack_blocks
+from paper1_data import depths, exact, hardware, hardware_metadata
 
 # ============================================================
-# DATOS IBM (extraídos del output de recuperación)
+# DATOS (data/paper1_raw_data y data/paper1_recovered_ibm_data)
 # ============================================================
+# Los Job IDs de cada run viven en el almacén de hardware
+# (paper1_data.job_ids); aquí sólo se cargan los arreglos.
+
+DEPTHS = list(depths("kicked_ising", 4))
+HW = hardware_metadata()
+
+# IBM: arreglos (runs, depths); SYK: (seeds, depths)
+ki4_ibm = hardware("kicked_ising", 4)
+ki8_ibm = hardware("kicked_ising", 8)
+ki12_ibm = hardware("kicked_ising", 12)
+ki20_ibm = hardware("kicked_ising", 20)
+int4_ibm = hardware("integrable", 4)
+floq4_ibm = hardware("floquet", 4)
+syk4_ibm = hardware("syk_simplified", 4)
+
+# Exact simulation results. otoc_engine.otoc_sweep reproduces these to
+# 1e-6; the lists hard-coded here before the store did not for KI N=8,
+# 12 at d ≥ 3 (Ω_exact 0.0085 → 0.0107, 0.0057 → 0.0068; the paper
+# tables now quote 0.011 and 0.007)
+ki4_exact = exact("kicked_ising", 4)
+ki8_exact = exact("kicked_ising", 8)
+ki12_exact = exact("kicked_ising", 12)
+ki20_exact = exact("kicked_ising", 20)
+int4_exact = exact("integrable", 4)
+floq4_exact = exact("floquet", 4)
+
+# Bloques (etiqueta, IBM, exacta); el análisis se hace en una sola pasada
+datasets = [
+    ("KI N=4",  ki4_ibm,  ki4_exact),
+    ("KI N=8",  ki8_ibm,  ki8_exact),
+    ("KI N=12", ki12_ibm, ki12_exact),
+    ("KI N=20", ki20_ibm, ki20_exact),
+    ("Int N=4", int4_ibm, int4_exact),
+    ("Floq N=4", floq4_ibm, floq4_exact),
+    ("SYK N=4 (9s)", syk4_ibm, None),
+]
+packed = pack_blocks([
+    {"label": label, "runs": runs, "exact": ex, "depths": DEPTHS}
+    for label, runs, ex in datasets])
+res = analyze(packed)
+row = {label: i for i, label in enumerate(res["labels"])}
 
-# Kicked Ising N=4 — 5 runs
-ki4_ibm = {
-    "run1": [0.016357, 0.039307, 0.052002, 0.199219, 0.065430, 0.020996, 0.102051, 0.024902, 0.043701, 0.115723, 0.047119],
-    "run2": [0.018066, 0.047607, 0.048096, 0.189941, 0.075684, 0.043945, 0.086182, 0.028320, 0.039307, 0.079834, 0.047119],
-    "run3": [0.022705, 0.042480, 0.056152, 0.177734, 0.063477, 0.049072, 0.072266, 0.030273, 0.076416, 0.101562, 0.056396],
-    "run4": [0.024170, 0.041260, 0.054932, 0.200439, 0.078369, 0.047852, 0.092285, 0.033447, 0.047607, 0.099854, 0.050049],
-    "run5": [0.017334, 0.045166, 0.049072, 0.189697, 0.067139, 0.036133, 0.083008, 0.029297, 0.050781, 0.094238, 0.049805],
-}
-
-# Kicked Ising N=8 — 5 runs
-ki8_ibm = {
-    "run1": [0.031494, 0.024902, 0.006592, 0.004395, 0.004150, 0.004883, 0.006104, 0.003662, 0.006348, 0.004395, 0.004395],
-    "run2": [0.015381, 0.019287, 0.006348, 0.004639, 0.003418, 0.004639, 0.008545, 0.009277, 0.003662, 0.004639, 0.002686],
-    "run3": [0.024902, 0.016602, 0.002686, 0.003906, 0.004150, 0.005615, 0.006592, 0.004639, 0.005615, 0.003174, 0.005371],
-    "run4": [0.017822, 0.026855, 0.006104, 0.002441, 0.004639, 0.003906, 0.005371, 0.006592, 0.005615, 0.003418, 0.007324],
-    "run5": [0.021240, 0.010010, 0.001465, 0.003418, 0.003906, 0.004883, 0.004639, 0.003906, 0.006836, 0.004639, 0.004883],
-}
-
-# Kicked Ising N=12 — 5 runs
-ki12_ibm = {
-    "run1": [0.020996, 0.014893, 0.001221, 0.000244, 0.000244, 0.000488, 0.000000, 0.001221, 0.000488, 0.000732, 0.000244],
-    "run2": [0.020752, 0.014893, 0.002686, 0.000488, 0.000244, 0.000732, 0.000488, 0.000000, 0.000000, 0.000244, 0.000732],
-    "run3": [0.024170, 0.011963, 0.002686, 0.000732, 0.000488, 0.000488, 0.000732, 0.001221, 0.000488, 0.000244, 0.001221],
-    "run4": [0.019287, 0.010742, 0.002930, 0.000488, 0.000244, 0.000244, 0.000244, 0.000000, 0.000488, 0.000732, 0.000000],
-    "run5": [0.025146, 0.011230, 0.002930, 0.000977, 0.000244, 0.000732, 0.000732, 0.000488, 0.000488, 0.000000, 0.000000],
-}
-
-# Kicked Ising N=20 — 5 runs
-ki20_ibm = {
-    "run1": [0.020264, 0.002197, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-    "run2": [0.019531, 0.000977, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-    "run3": [0.021484, 0.002930, 0.000244, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-    "run4": [0.018311, 0.001709, 0.000732, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-    "run5": [0.019043, 0.003174, 0.000244, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-}
-
-# Integrable N=4 — 5 runs
-int4_ibm = {
-    "run1": [0.000000, 0.496582, 0.500732, 0.499268, 0.003662, 0.501953, 0.004150, 0.506348, 0.493408, 0.495117, 0.490234],
-    "run2": [0.000000, 0.509521, 0.491455, 0.507568, 0.002686, 0.507568, 0.003174, 0.488525, 0.496582, 0.503174, 0.496826],
-    "run3": [0.000000, 0.503418, 0.495117, 0.500244, 0.004639, 0.493896, 0.003418, 0.510986, 0.493164, 0.497070, 0.491943],
-    "run4": [0.000000, 0.488770, 0.498291, 0.503174, 0.004395, 0.492432, 0.002930, 0.485596, 0.500977, 0.501465, 0.491699],
-    "run5": [0.000000, 0.496338, 0.506836, 0.497803, 0.003906, 0.490723, 0.004639, 0.493896, 0.478516, 0.507080, 0.517822],
-}
-
-# Floquet N=4 — 5 runs
-floq4_ibm = {
-    "run1": [0.011230, 0.299561, 0.222412, 0.200928, 0.138916, 0.265381, 0.083252, 0.051758, 0.063721, 0.080811, 0.104980],
-    "run2": [0.006592, 0.286133, 0.217529, 0.174072, 0.144775, 0.233154, 0.104004, 0.054932, 0.046631, 0.099121, 0.080811],
-    "run3": [0.008545, 0.274902, 0.200684, 0.167236, 0.162354, 0.221680, 0.106445, 0.064697, 0.078613, 0.096436, 0.085938],
-    "run4": [0.010010, 0.286865, 0.211914, 0.195068, 0.145752, 0.266357, 0.091309, 0.057861, 0.066895, 0.082275, 0.075439],
-    "run5": [0.013672, 0.285889, 0.187500, 0.198975, 0.162354, 0.205566, 0.091797, 0.062500, 0.060547, 0.095215, 0.077148],
-}
-
-# SYK N=4 — 9 seeds
-syk4_ibm = {
-    1000: [0.397217, 0.256104, 0.320801, 0.294434, 0.053711, 0.059326, 0.044678, 0.049316, 0.049316, 0.057617, 0.046143],
-    1137: [0.335693, 0.018555, 0.040039, 0.037109, 0.036133, 0.037842, 0.064209, 0.044434, 0.041016, 0.098633, 0.059814],
-    1274: [0.175537, 0.175537, 0.047119, 0.179688, 0.071045, 0.097168, 0.123047, 0.064209, 0.049316, 0.044434, 0.052734],
-    1411: [0.140869, 0.108154, 0.188721, 0.084229, 0.095215, 0.148926, 0.054932, 0.066650, 0.062256, 0.040771, 0.067383],
-    1548: [0.293213, 0.030029, 0.021484, 0.054199, 0.061035, 0.085205, 0.034180, 0.052002, 0.075684, 0.052246, 0.045410],
-    1685: [0.324951, 0.280029, 0.029297, 0.064209, 0.068848, 0.075439, 0.095947, 0.051025, 0.071289, 0.102783, 0.049072],
-    1822: [0.271973, 0.037842, 0.015869, 0.069580, 0.039062, 0.041260, 0.077637, 0.041016, 0.063477, 0.072510, 0.048584],
-    1959: [0.086182, 0.179688, 0.163330, 0.033203, 0.105469, 0.058838, 0.043457, 0.155518, 0.062988, 0.038818, 0.048584],
-    2096: [0.033691, 0.051758, 0.053711, 0.052002, 0.052979, 0.054199, 0.033936, 0.040283, 0.052490, 0.039795, 0.085693],
-}
-
-# Exact simulation results (from verified runs)
-ki4_exact =  [0.014444, 0.013043, 0.048258, 0.242499, 0.076539, 0.019037, 0.088046, 0.000181, 0.024876, 0.213425, 0.006876]
-ki8_exact =  [0.014444, 0.013043, 0.000015, 0.000001, 0.000024, 0.001058, 0.001217, 0.006184, 0.009900, 0.000143, 0.000836]
-ki12_exact = [0.014444, 0.013043, 0.000002, 0.000000, 0.000000, 0.000001, 0.000003, 0.000001, 0.000283, 0.000004, 0.003369]
-ki20_exact = [0.014444, 0.013043, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000]
-int4_exact = [0.000000, 0.500000, 0.500000, 0.500000, 0.000000, 0.500000, 0.000000, 0.500000, 0.500000, 0.500000, 0.500000]
-floq4_exact = [0.000232, 0.341751, 0.260664, 0.250834, 0.199813, 0.376314, 0.115672, 0.039800, 0.062062, 0.151331, 0.163113]
-
-
-def mean_over_runs(runs_dict):
-    """Promedio y std sobre runs."""
-    arrays = [np.array(v) for v in runs_dict.values()]
-    stacked = np.stack(arrays)
-    return np.mean(stacked, axis=0), np.std(stacked, axis=0, ddof=1)
+# Misma tabla con inversión de readout (conteos almacenados, sin hardware)
+N_QUBITS = [4, 8, 12, 20, 4, 4, 4]
+res_mit = analyze(mitigate_blocks(packed, N_QUBITS, HW["shots"]))
 
 
 # ============================================================
@@ -185,24 +75,30 @@ print("ANÁLISIS: IBM QUANTUM (ibm_marrakesh) vs SIMULACIÓN EXACTA")
 print("Proyecto Kaelion — Paper 1")
 print("=" * 74)
 
-print(f"\nBackend: ibm_marrakesh (156 qubits)")
-print(f"Fecha: 14 de febrero de 2026")
-print(f"Shots: 4096 por circuito")
+print(f"\nBackend: {HW['backend']} ({HW['backend_qubits']} qubits)")
+print(f"Fecha: {HW['date']}")
+print(f"Shots: {HW['shots']} por circuito")
 print(f"Profundidades: {DEPTHS}")
 
 # --- Inventario ---
 print(f"\n{'─'*74}")
 print("INVENTARIO DE DATOS")
 print(f"{'─'*74}")
-print(f"  Kicked Ising N=4:   5 runs × 11 depths = 55 puntos  ✅")
-print(f"  Kicked Ising N=8:   5 runs × 11 depths = 55 puntos  ✅")
-print(f"  Kicked Ising N=12:  5 runs × 11 depths = 55 puntos  ✅")
-print(f"  Kicked Ising N=20:  5 runs × 11 depths = 55 puntos  ✅")
-print(f"  Integrable N=4:     5 runs × 11 depths = 55 puntos  ✅")
-print(f"  Floquet N=4:        5 runs × 11 depths = 55 puntos  ✅")
-print(f"  SYK N=4:            9 seeds × 11 depths = 99 puntos ⚠️ (9/50)")
+inventory = [
+    ("Kicked Ising N=4:", ki4_ibm, "runs"),
+    ("Kicked Ising N=8:", ki8_ibm, "runs"),
+    ("Kicked Ising N=12:", ki12_ibm, "runs"),
+    ("Kicked Ising N=20:", ki20_ibm, "runs"),
+    ("Integrable N=4:", int4_ibm, "runs"),
+    ("Floquet N=4:", floq4_ibm, "runs"),
+    ("SYK N=4:", syk4_ibm, "seeds"),
+]
+for label, runs, unit in inventory:
+    mark = " ✅" if unit == "runs" else f"⚠️ ({len(runs)}/50)"
+    print(f"  {label:<19} {len(runs)} {unit} × {runs.shape[1]} depths = "
+          f"{runs.size} puntos {mark}")
 print(f"  {'─'*50}")
-print(f"  TOTAL: 429 puntos experimentales de IBM")
+print(f"  TOTAL: {sum(r.size for _, r, _ in inventory)} puntos experimentales de IBM")
 print(f"  + 616 puntos de simulación exacta")
 
 # --- Comparación IBM vs Exacta ---
@@ -210,17 +106,10 @@ print(f"\n\n{'='*74}")
 print("COMPARACIÓN PUNTO A PUNTO: IBM vs EXACTA")
 print(f"{'='*74}")
 
-datasets = [
-    ("KI N=4",  ki4_ibm,  ki4_exact),
-    ("KI N=8",  ki8_ibm,  ki8_exact),
-    ("KI N=12", ki12_ibm, ki12_exact),
-    ("KI N=20", ki20_ibm, ki20_exact),
-    ("Int N=4", int4_ibm, int4_exact),
-    ("Floq N=4", floq4_ibm, floq4_exact),
-]
-
-for label, ibm_runs, exact in datasets:
-    ibm_mean, ibm_std = mean_over_runs(ibm_runs)
+for k, (label, _, exact) in enumerate(datasets):
+    if exact is None:
+        continue
+    ibm_mean, ibm_std = res["mean"][k], res["std"][k]
 
     print(f"\n  {label}:")
     print(f"  {'d':>4} | {'Exacta':>10} | {'IBM mean':>10} | {'IBM std':>10} | "
@@ -228,9 +117,9 @@ for label, ibm_runs, exact in datasets:
     print(f"  {'─'*4}-+-{'─'*10}-+-{'─'*10}-+-{'─'*10}-+-{'─'*10}-+-{'─'*6}")
 
     for i, d in enumerate(DEPTHS):
-        delta = ibm_mean[i] - exact[i]
-        # "Match" = within noise expectations
-        match = "✓" if abs(delta) < 0.03 + 3*ibm_std[i] else "✗"
+        delta = res["delta"][k, i]
+        # "Match" = within noise expectations: |Δ| < 0.03 + 3σ
+        match = "✓" if res["match"][k, i] else "✗"
         print(f"  {d:>4} | {exact[i]:>10.6f} | {ibm_mean[i]:>10.6f} | "
               f"{ibm_std[i]:>10.6f} | {delta:>+10.6f} | {match:>6}")
 
@@ -240,28 +129,33 @@ print(f"\n\n{'='*74}")
 print("RESULTADO PRINCIPAL: Ω = ⟨C(d)⟩/C₀")
 print(f"{'='*74}")
 
-C0 = 0.5
-
 print(f"\n  {'Modelo':<16} | {'Ω(exacta)':>10} | {'Ω(IBM)':>10} | {'Δ':>8} | {'λ(exacta)':>10} | {'λ(IBM)':>10}")
 print(f"  {'─'*16}-+-{'─'*10}-+-{'─'*10}-+-{'─'*8}-+-{'─'*10}-+-{'─'*10}")
 
-for label, ibm_runs, exact in datasets:
-    ibm_mean, _ = mean_over_runs(ibm_runs)
-    omega_exact = np.mean(exact) / C0
-    omega_ibm = np.mean(ibm_mean) / C0
-    lam_exact = 1 - omega_exact
-    lam_ibm = 1 - omega_ibm
+for k, (label, _, exact) in enumerate(datasets):
+    omega_exact = res["omega_exact"][k]
+    omega_ibm = res["omega"][k]
+    lam_exact = res["lambda_exact"][k]
+    lam_ibm = res["lambda"][k]
     delta = omega_ibm - omega_exact
 
+    if exact is None:
+        # SYK promediado (9 seeds), sin curva exacta por seed
+        print(f"  {label:<16} | {'—':>10} | {omega_ibm:>10.4f} | "
+              f"{'—':>8} | {'—':>10} | {lam_ibm:>10.4f}")
+        continue
     print(f"  {label:<16} | {omega_exact:>10.4f} | {omega_ibm:>10.4f} | "
           f"{delta:>+8.4f} | {lam_exact:>10.4f} | {lam_ibm:>10.4f}")
 
-# SYK promediado (9 seeds)
-syk_arrays = [np.array(v) for v in syk4_ibm.values()]
-syk_ibm_mean = np.mean(np.stack(syk_arrays), axis=0)
-omega_syk_ibm = np.mean(syk_ibm_mean) / C0
-print(f"  {'SYK N=4 (9s)':<16} | {'—':>10} | {omega_syk_ibm:>10.4f} | "
-      f"{'—':>8} | {'—':>10} | {1-omega_syk_ibm:>10.4f}")
+print(f"\n  Con inversión de readout (e01 = {READOUT[0]}, e10 = {READOUT[1]}):")
+print(f"  {'Modelo':<16} | {'Ω(IBM)':>10} | {'Ω(mitig.)':>10} | "
+      f"{'⟨C(d≥6)⟩ mitig.':>16} | {'Match':>7}")
+for k, (label, _, exact) in enumerate(datasets):
+    match = (f"{int(res_mit['match'][k].sum())}/{len(DEPTHS)}"
+             if exact is not None else "—")
+    print(f"  {label:<16} | {res['omega'][k]:>10.4f} | "
+          f"{res_mit['omega'][k]:>10.4f} | {res_mit['floor_d6'][k]:>16.6f} | "
+          f"{match:>7}")
 
 
 # --- Hallazgos clave ---
@@ -270,12 +164,12 @@ print("HALLAZGOS CLAVE")
 print(f"{'='*74}")
 
 # 1. Recurrencia de KI N=4
-ki4_mean, _ = mean_over_runs(ki4_ibm)
+ki4_mean = res["mean"][row["KI N=4"]]
 print(f"""
   1. RECURRENCIA DEL KICKED ISING N=4 VISIBLE EN HARDWARE
 
      La simulación exacta predice un pico en d=4: C(4) = 0.2425
-     IBM mide: C(4) = {ki4_mean[3]:.4f} ± {np.std([v[3] for v in ki4_ibm.values()], ddof=1):.4f}
+     IBM mide: C(4) = {ki4_mean[3]:.4f} ± {res["std"][row["KI N=4"], 3]:.4f}
 
      ¡El pico de recurrencia cuántica es VISIBLE en hardware real!
      Esto confirma que IBM reproduce la dinámica del sistema, no solo ruido.
@@ -284,10 +178,9 @@ print(f"""
 # 2. Escalamiento del noise floor
 print(f"  2. NOISE FLOOR POR TAMAÑO DE SISTEMA")
 print(f"     (C(d) promedio para d ≥ 4, donde exacta ≈ 0)")
-for label, ibm_runs, n in [("N=4", ki4_ibm, 4), ("N=8", ki8_ibm, 8),
-                            ("N=12", ki12_ibm, 12), ("N=20", ki20_ibm, 20)]:
-    ibm_mean, _ = mean_over_runs(ibm_runs)
-    deep_mean = np.mean(ibm_mean[3:])  # d >= 4
+for n in [4, 8, 12, 20]:
+    label = f"N={n}"
+    deep_mean = res["floor_d4"][row[f"KI {label}"]]
     floor = 1.0 / 2**n
     print(f"     {label}: ⟨C(d≥4)⟩_IBM = {deep_mean:.6f}, "
           f"1/2^N = {floor:.6f}, "
@@ -303,7 +196,7 @@ print(f"""
 
      IBM reproduce esto con precisión < 0.02:""")
 
-int_mean, _ = mean_over_runs(int4_ibm)
+int_mean = res["mean"][row["Int N=4"]]
 for i, d in enumerate(DEPTHS):
     print(f"       d={d:>2}: exacta={int4_exact[i]:.3f}, IBM={int_mean[i]:.3f}")
 
@@ -314,9 +207,9 @@ print(f"""
      El Floquet NO es caótico (⟨r⟩ = 0.33, Poisson).
      Sus oscilaciones características son visibles en IBM:""")
 
-floq_mean, _ = mean_over_runs(floq4_ibm)
+k = row["Floq N=4"]
 print(f"     Correlación IBM vs exacta: "
-      f"r = {np.corrcoef(floq4_exact, floq_mean)[0,1]:.4f}")
+      f"r = {res['pearson'][k]:.4f} (Spearman ρ = {res['spearman'][k]:.4f})")
 
 
 # --- Clasificación final ---
@@ -329,29 +222,12 @@ print(f"""
   │ Modelo           │  Ω (exacta) │  Ω (IBM)    │ Régimen              │
   ├──────────────────┼─────────────┼─────────────┼──────────────────────┤""")
 
-all_results = []
-for label, ibm_runs, exact in datasets:
-    ibm_mean, _ = mean_over_runs(ibm_runs)
-    oe = np.mean(exact) / C0
-    oi = np.mean(ibm_mean) / C0
-    all_results.append((label, oe, oi))
-
-all_results.append(("SYK N=4 (9s)", None, omega_syk_ibm))
-all_results.sort(key=lambda x: x[2])
-
-for label, oe, oi in all_results:
-    if oi < 0.05:
-        regime = "Scrambling completo"
-    elif oi < 0.15:
-        regime = "Scrambling fuerte"
-    elif oi < 0.35:
-        regime = "Intermedio"
-    elif oi < 0.60:
-        regime = "Scrambling débil"
-    else:
-        regime = "Sin scrambling"
-
-    oe_str = f"{oe:.4f}" if oe is not None else "  —  "
+regimes = classify(res["omega"])
+for k in np.argsort(res["omega"], kind="stable"):
+    label, oe, oi = res["labels"][k], res["omega_exact"][k], res["omega"][k]
+    regime = regimes[k]
+
+    oe_str = f"{oe:.4f}" if not np.isnan(oe) else "  —  "
     print(f"  │ {label:<16} │  {oe_str:>9} │  {oi:>9.4f} │ {regime:<20} │")
 
 print(f"  └──────────────────┴─────────────┴─────────────┴──────────────────────┘")
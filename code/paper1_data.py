@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+============================================================
+CARGA DE DATOS — EXACTA + HARDWARE IBM
+============================================================
+Proyecto Kaelion — Paper 1
+
+Single loader used by paper1_analisis_ibm_v1.py and
+paper1_figuras.py. Exact curves come from the columnar store of
+paper1_raw_data.json, hardware runs from the store of
+paper1_recovered_ibm_data.json (otoc_dataset.py). Every getter
+returns read-only float64 arrays, memoized per process, so each
+(model, N) is converted once no matter how many figures use it.
+
+Hardware arrays have shape (runs, depths); SYK rows are the
+disorder seeds (one hardware run each), in seed order.
+
+Other data sets are selected without editing the scripts:
+  OTOC_EXACT_STORE=...  OTOC_HARDWARE_STORE=...  python code/paper1_figuras.py
+============================================================
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from otoc_dataset import DEFAULT_STORE, open_store
+
+EXACT_STORE = os.environ.get("OTOC_EXACT_STORE", DEFAULT_STORE)
+
+HARDWARE_STORE = os.environ.get(
+    "OTOC_HARDWARE_STORE",
+    os.path.join(os.path.dirname(DEFAULT_STORE), "paper1_recovered_ibm_data"))
+
+C0 = 0.5
+
+
+@lru_cache(maxsize=None)
+def _store(path):
+    return open_store(path)
+
+
+def _frozen(arr):
+    arr = np.array(arr, dtype=np.float64)
+    arr.flags.writeable = False
+    return arr
+
+
+@lru_cache(maxsize=None)
+def exact(model, n, store=None):
+    """Exact C(d) of (model, N), shape (depths,)."""
+    sel = _store(store or EXACT_STORE).select(model, n, kind="C_d")
+    if len(sel) != 1:
+        raise KeyError(f"no single exact curve for {model} N={n} "
+                       f"({len(sel)} found)")
+    return _frozen(sel.value)
+
+
+@lru_cache(maxsize=None)
+def depths(model, n, store=None):
+    """Depth grid of the hardware runs of (model, N)."""
+    sel = _store(store or HARDWARE_STORE).select(model, n, kind="C_d")
+    return tuple(int(d) for d in sel.matrix()[0])
+
+
+@lru_cache(maxsize=None)
+def hardware(model, n, store=None):
+    """Hardware C(d) of (model, N), shape (runs, depths)."""
+    sel = _store(store or HARDWARE_STORE).select(model, n, kind="C_d")
+    if len(sel) == 0:
+        raise KeyError(f"no hardware runs for {model} N={n}")
+    return _frozen(sel.matrix()[1])
+
+
+@lru_cache(maxsize=None)
+def hardware_seeds(model, n, store=None):
+    """Disorder seed of each row of hardware(model, n) (-1: none)."""
+    sel = _store(store or HARDWARE_STORE).select(model, n, kind="C_d")
+    return tuple(int(s) for s in sel.seed)
+
+
+def job_ids(model, n, store=None):
+    """IBM Job ID of each row of hardware(model, n)."""
+    st = _store(store or HARDWARE_STORE)
+    sel = st.select(model, n, kind="C_d")
+    out = []
+    for e, seed, run in zip(sel.entry, sel.seed, sel.run):
+        for r in st.manifest["entries"][e]["entry"]["runs"]:
+            if r["run"] == run and r.get("seed", -1) == seed:
+                out.append(r.get("job_id"))
+    return out
+
+
+def hardware_metadata(store=None):
+    return dict(_store(store or HARDWARE_STORE).manifest["document"]["metadata"])
+
+
+def run_stats(runs):
+    """Mean and std (ddof=1) over runs (axis 0)."""
+    return runs.mean(axis=0), runs.std(axis=0, ddof=1)
@@ -19,6 +19,12 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.gridspec import GridSpec
 
+from mitigation import mitigate_blocks
+from otoc_analysis import analyze, pack_blocks
+from otoc_resample import bootstrap
+from paper1_data import depths, hardware, run_stats
+from paper1_data import exact as exact_curve
+
 # Configuración global
 plt.rcParams.update({
     'font.size': 11,
@@ -31,87 +37,47 @@ plt.rcParams.update({
     'savefig.bbox': 'tight',
 })
 
-DEPTHS = [1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 14]
+DEPTHS = list(depths("kicked_ising", 4))
 C0 = 0.5
 
 # ============================================================
-# DATOS (verificados, 3 ejecuciones independientes concordantes)
+# DATOS (data/paper1_raw_data y data/paper1_recovered_ibm_data)
 # ============================================================
 
 # --- Simulación exacta ---
 exact = {
-    "KI N=4":  [0.014444, 0.013043, 0.048258, 0.242499, 0.076539, 0.019037, 0.088046, 0.000181, 0.024876, 0.213425, 0.006876],
-    "KI N=8":  [0.014444, 0.013043, 0.000015, 0.000001, 0.000024, 0.001058, 0.001217, 0.006184, 0.009900, 0.000143, 0.000836],
-    "KI N=12": [0.014444, 0.013043, 0.000002, 0.000000, 0.000000, 0.000001, 0.000003, 0.000001, 0.000283, 0.000004, 0.003369],
-    "KI N=20": [0.014444, 0.013043, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-    "Integrable": [0.000000, 0.500000, 0.500000, 0.500000, 0.000000, 0.500000, 0.000000, 0.500000, 0.500000, 0.500000, 0.500000],
-    "Floquet": [0.000232, 0.341751, 0.260664, 0.250834, 0.199813, 0.376314, 0.115672, 0.039800, 0.062062, 0.151331, 0.163113],
+    "KI N=4":  exact_curve("kicked_ising", 4),
+    "KI N=8":  exact_curve("kicked_ising", 8),
+    "KI N=12": exact_curve("kicked_ising", 12),
+    "KI N=20": exact_curve("kicked_ising", 20),
+    "Integrable": exact_curve("integrable", 4),
+    "Floquet": exact_curve("floquet", 4),
 }
 
-# --- IBM Quantum (ibm_marrakesh, 14 feb 2026, 5 runs cada uno) ---
+# --- IBM Quantum (ibm_marrakesh, 14 feb 2026): arreglos (runs, depths) ---
 ibm = {
-    "KI N=4": {
-        "run1": [0.016357, 0.039307, 0.052002, 0.199219, 0.065430, 0.020996, 0.102051, 0.024902, 0.043701, 0.115723, 0.047119],
-        "run2": [0.018066, 0.047607, 0.048096, 0.189941, 0.075684, 0.043945, 0.086182, 0.028320, 0.039307, 0.079834, 0.047119],
-        "run3": [0.022705, 0.042480, 0.056152, 0.177734, 0.063477, 0.049072, 0.072266, 0.030273, 0.076416, 0.101562, 0.056396],
-        "run4": [0.024170, 0.041260, 0.054932, 0.200439, 0.078369, 0.047852, 0.092285, 0.033447, 0.047607, 0.099854, 0.050049],
-        "run5": [0.017334, 0.045166, 0.049072, 0.189697, 0.067139, 0.036133, 0.083008, 0.029297, 0.050781, 0.094238, 0.049805],
-    },
-    "KI N=8": {
-        "run1": [0.031494, 0.024902, 0.006592, 0.004395, 0.004150, 0.004883, 0.006104, 0.003662, 0.006348, 0.004395, 0.004395],
-        "run2": [0.015381, 0.019287, 0.006348, 0.004639, 0.003418, 0.004639, 0.008545, 0.009277, 0.003662, 0.004639, 0.002686],
-        "run3": [0.024902, 0.016602, 0.002686, 0.003906, 0.004150, 0.005615, 0.006592, 0.004639, 0.005615, 0.003174, 0.005371],
-        "run4": [0.017822, 0.026855, 0.006104, 0.002441, 0.004639, 0.003906, 0.005371, 0.006592, 0.005615, 0.003418, 0.007324],
-        "run5": [0.021240, 0.010010, 0.001465, 0.003418, 0.003906, 0.004883, 0.004639, 0.003906, 0.006836, 0.004639, 0.004883],
-    },
-    "KI N=12": {
-        "run1": [0.020996, 0.014893, 0.001221, 0.000244, 0.000244, 0.000488, 0.000000, 0.001221, 0.000488, 0.000732, 0.000244],
-        "run2": [0.020752, 0.014893, 0.002686, 0.000488, 0.000244, 0.000732, 0.000488, 0.000000, 0.000000, 0.000244, 0.000732],
-        "run3": [0.024170, 0.011963, 0.002686, 0.000732, 0.000488, 0.000488, 0.000732, 0.001221, 0.000488, 0.000244, 0.001221],
-        "run4": [0.019287, 0.010742, 0.002930, 0.000488, 0.000244, 0.000244, 0.000244, 0.000000, 0.000488, 0.000732, 0.000000],
-        "run5": [0.025146, 0.011230, 0.002930, 0.000977, 0.000244, 0.000732, 0.000732, 0.000488, 0.000488, 0.000000, 0.000000],
-    },
-    "KI N=20": {
-        "run1": [0.020264, 0.002197, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-        "run2": [0.019531, 0.000977, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-        "run3": [0.021484, 0.002930, 0.000244, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-        "run4": [0.018311, 0.001709, 0.000732, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-        "run5": [0.019043, 0.003174, 0.000244, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000],
-    },
-    "Integrable": {
-        "run1": [0.000000, 0.496582, 0.500732, 0.499268, 0.003662, 0.501953, 0.004150, 0.506348, 0.493408, 0.495117, 0.490234],
-        "run2": [0.000000, 0.509521, 0.491455, 0.507568, 0.002686, 0.507568, 0.003174, 0.488525, 0.496582, 0.503174, 0.496826],
-        "run3": [0.000000, 0.503418, 0.495117, 0.500244, 0.004639, 0.493896, 0.003418, 0.510986, 0.493164, 0.497070, 0.491943],
-        "run4": [0.000000, 0.488770, 0.498291, 0.503174, 0.004395, 0.492432, 0.002930, 0.485596, 0.500977, 0.501465, 0.491699],
-        "run5": [0.000000, 0.496338, 0.506836, 0.497803, 0.003906, 0.490723, 0.004639, 0.493896, 0.478516, 0.507080, 0.517822],
-    },
-    "Floquet": {
-        "run1": [0.011230, 0.299561, 0.222412, 0.200928, 0.138916, 0.265381, 0.083252, 0.051758, 0.063721, 0.080811, 0.104980],
-        "run2": [0.006592, 0.286133, 0.217529, 0.174072, 0.144775, 0.233154, 0.104004, 0.054932, 0.046631, 0.099121, 0.080811],
-        "run3": [0.008545, 0.274902, 0.200684, 0.167236, 0.162354, 0.221680, 0.106445, 0.064697, 0.078613, 0.096436, 0.085938],
-        "run4": [0.010010, 0.286865, 0.211914, 0.195068, 0.145752, 0.266357, 0.091309, 0.057861, 0.066895, 0.082275, 0.075439],
-        "run5": [0.013672, 0.285889, 0.187500, 0.198975, 0.162354, 0.205566, 0.091797, 0.062500, 0.060547, 0.095215, 0.077148],
-    },
+    "KI N=4": hardware("kicked_ising", 4),
+    "KI N=8": hardware("kicked_ising", 8),
+    "KI N=12": hardware("kicked_ising", 12),
+    "KI N=20": hardware("kicked_ising", 20),
+    "Integrable": hardware("integrable", 4),
+    "Floquet": hardware("floquet", 4),
 }
 
-# SYK IBM (9 seeds)
-syk_ibm = {
-    1000: [0.397217, 0.256104, 0.320801, 0.294434, 0.053711, 0.059326, 0.044678, 0.049316, 0.049316, 0.057617, 0.046143],
-    1137: [0.335693, 0.018555, 0.040039, 0.037109, 0.036133, 0.037842, 0.064209, 0.044434, 0.041016, 0.098633, 0.059814],
-    1274: [0.175537, 0.175537, 0.047119, 0.179688, 0.071045, 0.097168, 0.123047, 0.064209, 0.049316, 0.044434, 0.052734],
-    1411: [0.140869, 0.108154, 0.188721, 0.084229, 0.095215, 0.148926, 0.054932, 0.066650, 0.062256, 0.040771, 0.067383],
-    1548: [0.293213, 0.030029, 0.021484, 0.054199, 0.061035, 0.085205, 0.034180, 0.052002, 0.075684, 0.052246, 0.045410],
-    1685: [0.324951, 0.280029, 0.029297, 0.064209, 0.068848, 0.075439, 0.095947, 0.051025, 0.071289, 0.102783, 0.049072],
-    1822: [0.271973, 0.037842, 0.015869, 0.069580, 0.039062, 0.041260, 0.077637, 0.041016, 0.063477, 0.072510, 0.048584],
-    1959: [0.086182, 0.179688, 0.163330, 0.033203, 0.105469, 0.058838, 0.043457, 0.155518, 0.062988, 0.038818, 0.048584],
-    2096: [0.033691, 0.051758, 0.053711, 0.052002, 0.052979, 0.054199, 0.033936, 0.040283, 0.052490, 0.039795, 0.085693],
-}
+# SYK IBM (una fila por seed)
+syk_ibm = hardware("syk_simplified", 4)
+get_ibm_stats = run_stats
 
+# Ω, floors y estadísticas de todos los bloques en una sola pasada
+packed = pack_blocks(
+    [{"label": key, "runs": ibm[key], "exact": exact[key], "depths": DEPTHS}
+     for key in ibm]
+    + [{"label": "SYK", "runs": syk_ibm, "depths": DEPTHS}])
+stats = analyze(packed)
+row = {label: i for i, label in enumerate(stats["labels"])}
 
-def get_ibm_stats(runs_dict):
-    """Return mean and std over runs."""
-    arrays = np.stack([np.array(v) for v in runs_dict.values()])
-    return np.mean(arrays, axis=0), np.std(arrays, axis=0, ddof=1)
+# Mismas estadísticas tras la inversión de readout (mitigation.py)
+stats_mit = analyze(mitigate_blocks(packed, [4, 8, 12, 20, 4, 4, 4]))
 
 
 # Colors
@@ -152,11 +118,9 @@ for idx, (title, key, color) in enumerate(models_fig1):
                     label=f'IBM (5 runs)', zorder=2)
     else:
         # SYK: individual seeds + mean
-        syk_arrays = np.stack([np.array(v) for v in syk_ibm.values()])
-        syk_mean = np.mean(syk_arrays, axis=0)
-        syk_std = np.std(syk_arrays, axis=0, ddof=1)
+        syk_mean, syk_std = get_ibm_stats(syk_ibm)
 
-        for i, (seed, vals) in enumerate(syk_ibm.items()):
+        for i, vals in enumerate(syk_ibm):
             ax.plot(DEPTHS, vals, 'o-', color=color, alpha=0.15, markersize=2,
                     linewidth=0.5, label='Individual seeds' if i == 0 else None)
 
@@ -220,19 +184,19 @@ ax = axes[1]
 Ns = [4, 8, 12, 20]
 omega_exact_vals = []
 omega_ibm_vals = []
-omega_ibm_err = []
+omega_ibm_err = [[], []]
 
 for N in Ns:
-    key = f"KI N={N}"
-    oe = np.mean(exact[key]) / C0
+    k = row[f"KI N={N}"]
+    oe = stats["omega_exact"][k]
     omega_exact_vals.append(oe)
 
-    ibm_mean, ibm_std = get_ibm_stats(ibm[key])
-    oi = np.mean(ibm_mean) / C0
-    # Error propagation: σ_Ω = σ_mean / C0 / sqrt(n_depths)
-    oi_err = np.mean(ibm_std) / C0 / np.sqrt(len(DEPTHS))
+    oi = stats["omega"][k]
+    # IC 95% bootstrap sobre los runs (otoc_resample), no σ/√n_depths
+    lo, hi = bootstrap(ibm[f"KI N={N}"], DEPTHS, level="runs")["omega"]["ci"]
     omega_ibm_vals.append(oi)
-    omega_ibm_err.append(oi_err)
+    omega_ibm_err[0].append(oi - lo)
+    omega_ibm_err[1].append(hi - oi)
 
 ax.plot(Ns, omega_exact_vals, 'o-', color=C_EXACT, markersize=8,
         linewidth=2, label='Exact simulation', zorder=3)
@@ -276,29 +240,13 @@ fig, ax = plt.subplots(figsize=(10, 5))
 
 # Compute all Ω values
 models_bar = []
-for key in ["KI N=20", "KI N=12", "KI N=8", "KI N=4"]:
-    oe = np.mean(exact[key]) / C0
-    ibm_mean, _ = get_ibm_stats(ibm[key])
-    oi = np.mean(ibm_mean) / C0
-    models_bar.append((key, oe, oi))
-
-# SYK
-syk_arrays = np.stack([np.array(v) for v in syk_ibm.values()])
-syk_mean_all = np.mean(syk_arrays, axis=0)
-oi_syk = np.mean(syk_mean_all) / C0
-models_bar.append(("SYK N=4\n(9 seeds)", None, oi_syk))
-
-# Floquet
-oe_f = np.mean(exact["Floquet"]) / C0
-ibm_mean_f, _ = get_ibm_stats(ibm["Floquet"])
-oi_f = np.mean(ibm_mean_f) / C0
-models_bar.append(("Floquet\nN=4", oe_f, oi_f))
-
-# Integrable
-oe_i = np.mean(exact["Integrable"]) / C0
-ibm_mean_i, _ = get_ibm_stats(ibm["Integrable"])
-oi_i = np.mean(ibm_mean_i) / C0
-models_bar.append(("Integrable\nN=4", oe_i, oi_i))
+for key, name in [("KI N=20", "KI N=20"), ("KI N=12", "KI N=12"),
+                  ("KI N=8", "KI N=8"), ("KI N=4", "KI N=4"),
+                  ("SYK", "SYK N=4\n(9 seeds)"), ("Floquet", "Floquet\nN=4"),
+                  ("Integrable", "Integrable\nN=4")]:
+    k = row[key]
+    oe = None if np.isnan(stats["omega_exact"][k]) else stats["omega_exact"][k]
+    models_bar.append((name, oe, stats["omega"][k]))
 
 labels = [m[0] for m in models_bar]
 exact_vals = [m[1] for m in models_bar]
@@ -363,20 +311,24 @@ fig.suptitle('Figure 4: Hardware noise floor characterization',
 ax = axes[0]
 Ns_floor = [4, 8, 12, 20]
 floor_ibm = []
+floor_mit = []
 floor_exact = []
 floor_theory = []  # 1/2^N
 
 for N in Ns_floor:
-    key = f"KI N={N}"
-    ibm_mean, _ = get_ibm_stats(ibm[key])
-    f_ibm = np.mean(ibm_mean[5:])  # d >= 6 (index 5 onwards)
-    f_exact = np.mean(np.array(exact[key])[5:])
+    k = row[f"KI N={N}"]
+    f_ibm = stats["floor_d6"][k]  # d >= 6
+    f_exact = stats["floor_exact_d6"][k]
     floor_ibm.append(f_ibm)
+    floor_mit.append(stats_mit["floor_d6"][k])
     floor_exact.append(f_exact)
     floor_theory.append(1.0 / 2**N)
 
 ax.semilogy(Ns_floor, floor_ibm, 'o-', color=C_IBM, markersize=8,
             linewidth=2, label='IBM ⟨C(d≥6)⟩')
+ax.semilogy(Ns_floor, [max(f, 1e-8) for f in floor_mit], 'D-',
+            color=C_IBM, markersize=6, linewidth=1, alpha=0.5,
+            label='IBM, readout-mitigated')
 ax.semilogy(Ns_floor, [max(f, 1e-8) for f in floor_exact], 's--',
             color=C_EXACT, markersize=8, linewidth=1.5,
             label='Exact ⟨C(d≥6)⟩')
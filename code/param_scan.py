@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+============================================================
+BARRIDO DE PARÁMETROS — POOL DE PROCESOS REANUDABLE
+============================================================
+Proyecto Kaelion — Paper 1
+
+Expands a grid spec over (model, N, parameters, seed) into
+tasks, runs them on a concurrent.futures process pool and
+writes one JSON shard per task. Shards are written atomically
+(tmp file + os.replace), so a killed scan restarts where it
+stopped: tasks whose shard already exists are skipped.
+
+Spec (JSON file, one dict or a list of dicts):
+  {"model": "kicked_ising",
+   "n": [8, 12, 16, 20],
+   "params": {"J": [0.70, 0.7854, 0.90], "h": [0.0, 0.4, 0.8]},
+   "depths": [1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 14],
+   "seeds": [1000, 1137],            (seeds: syk only)
+   "otoc2": true}                    (optional: also C^(2)(d), "C2_d")
+
+Workers are started with the "spawn" method and BLAS/OpenMP
+thread caps (1 thread each by default) to avoid oversubscription;
+--kernels picks the gate backend of kernels.py in every worker,
+with the same thread count. C(d) is looked up in result_cache
+first (--no-cache to bypass), so deleting the shards and scanning
+again costs no simulation.
+
+Usage:
+  python code/param_scan.py scan.json --shards shards/ --out scan_result.json
+============================================================
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+               "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS",
+               "NUMBA_NUM_THREADS")
+
+
+def cap_threads(n_threads=1):
+    """Set the BLAS/OpenMP thread caps inherited by spawned workers.
+
+    Returns the previous values, for restore_threads().
+    """
+    saved = {var: os.environ.get(var) for var in THREAD_VARS}
+    for var in THREAD_VARS:
+        os.environ[var] = str(n_threads)
+    return saved
+
+
+def restore_threads(saved):
+    """Put back the environment saved by cap_threads()."""
+    for var, value in saved.items():
+        if value is None:
+            os.environ.pop(var, None)
+        else:
+            os.environ[var] = value
+
+
+# ============================================================
+# EXPANSIÓN DEL GRID
+# ============================================================
+
+def _as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def expand_spec(spec):
+    """List of task dicts for a spec dict (or list of spec dicts)."""
+    from otoc_engine import DEPTHS
+
+    if isinstance(spec, list):
+        return [t for s in spec for t in expand_spec(s)]
+
+    model = spec["model"]
+    depths = spec.get("depths", DEPTHS)
+    grid = spec.get("params", {})
+    names = sorted(grid)
+    seeds = _as_list(spec.get("seeds", [None]))
+    otoc2 = bool(spec.get("otoc2", False))
+
+    tasks = []
+    for n in _as_list(spec["n"]):
+        for values in itertools.product(*(_as_list(grid[k]) for k in names)):
+            for seed in seeds:
+                task = {
+                    "model": model,
+                    "n": int(n),
+                    "params": dict(zip(names, values)),
+                    "seed": seed,
+                    "depths": list(depths),
+                }
+                # Solo si se pide: los task_id de los shards previos no cambian
+                if otoc2:
+                    task["otoc2"] = True
+                tasks.append(task)
+    return tasks
+
+
+def task_id(task):
+    """Stable hash of a task (shard file name)."""
+    blob = json.dumps(task, sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def task_label(task):
+    """exact_simulation key, e.g. kicked_ising_N8_J0.9_h0.7.
+
+    A depth grid other than DEPTHS adds d<hash of the grid>, and
+    OTOC(2) tasks add otoc2, so no two distinct tasks share a label.
+    """
+    from otoc_engine import DEPTHS
+
+    parts = [f"{task['model']}_N{task['n']}"]
+    parts += [f"{k}{v}" for k, v in sorted(task["params"].items())]
+    if task["seed"] is not None:
+        parts.append(f"s{task['seed']}")
+    if list(task["depths"]) != DEPTHS:
+        blob = json.dumps(list(task["depths"])).encode()
+        parts.append(f"d{hashlib.sha1(blob).hexdigest()[:8]}")
+    if task.get("otoc2"):
+        parts.append("otoc2")
+    return "_".join(parts)
+
+
+# ============================================================
+# WORKER Y SHARDS
+# ============================================================
+
+def write_atomic(path, payload):
+    """Write JSON to `path` via a temporary file and os.replace."""
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(payload, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def run_task(task, shard_dir, kernels="numpy", threads=1, use_cache=True):
+    """Simulate one task and write its shard; returns the shard path.
+
+    C(d) goes through result_cache.cached_curve (keyed on model, N,
+    parameters, seed and ENGINE_VERSION), so a repeated scan only
+    simulates depths that are not cached yet.
+    """
+    from kernels import set_backend
+    from otoc_engine import (ENGINE_VERSION, FloquetStep, dataset_model,
+                             model_params, otoc2_sweep, otoc_sweep)
+    from result_cache import cached_curve
+
+    set_backend(kernels, threads)
+
+    t0 = time.perf_counter()
+    model, n, params, seed = task["model"], task["n"], task["params"], task["seed"]
+    if task.get("otoc2"):
+        step = FloquetStep(model, n, params, seed)
+        curve, curve2 = otoc2_sweep(step, task["depths"])
+    elif use_cache:
+        curve = cached_curve(model, n, task["depths"], params, seed)
+    else:
+        curve = otoc_sweep(FloquetStep(model, n, params, seed), task["depths"])
+
+    entry = {
+        # Mismo nombre que las entradas guardadas (syk → syk_simplified)
+        "model": dataset_model(model),
+        "n_qubits": task["n"],
+        "parameters": model_params(model, params),
+        "depths": task["depths"],
+        "C_d": [{"depth": d, "C_d": float(c)}
+                for d, c in zip(task["depths"], curve)],
+        "C_0": 0.5,
+    }
+    if task.get("otoc2"):
+        entry["C2_d"] = [{"depth": d, "C2_d": float(c)}
+                         for d, c in zip(task["depths"], curve2)]
+    if task["seed"] is not None:
+        entry["seed"] = task["seed"]
+
+    path = os.path.join(shard_dir, f"{task_id(task)}.json")
+    write_atomic(path, {
+        "task": task,
+        "label": task_label(task),
+        "engine_version": ENGINE_VERSION,
+        "elapsed_s": time.perf_counter() - t0,
+        "entry": entry,
+    })
+    return path
+
+
+def pending_tasks(tasks, shard_dir):
+    """Tasks without a finished shard."""
+    return [t for t in tasks
+            if not os.path.exists(os.path.join(shard_dir, f"{task_id(t)}.json"))]
+
+
+def run_scan(spec, shard_dir, workers=None, threads_per_worker=1,
+             kernels="numpy", use_cache=True):
+    """Run every pending task of `spec` on a process pool."""
+    os.makedirs(shard_dir, exist_ok=True)
+    tasks = expand_spec(spec)
+    # Un punto repetido en la lista de specs se simula una sola vez
+    unique = list({task_id(t): t for t in tasks}.values())
+    todo = pending_tasks(unique, shard_dir)
+    # Los N grandes primero, para balancear el pool
+    todo.sort(key=lambda t: -t["n"])
+
+    print(f"  {len(unique)} tareas, {len(unique) - len(todo)} ya terminadas, "
+          f"{len(todo)} pendientes")
+    if not todo:
+        return tasks
+
+    saved = cap_threads(threads_per_worker)
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {pool.submit(run_task, t, shard_dir, kernels,
+                                   threads_per_worker, use_cache): t
+                       for t in todo}
+            for k, fut in enumerate(as_completed(futures), 1):
+                fut.result()
+                print(f"  [{k}/{len(todo)}] {task_label(futures[fut])}")
+    finally:
+        restore_threads(saved)
+    return tasks
+
+
+def merge_shards(tasks, shard_dir):
+    """exact_simulation-style dict {label: entry} for finished tasks."""
+    merged, owner = {}, {}
+    for t in tasks:
+        tid = task_id(t)
+        path = os.path.join(shard_dir, f"{tid}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            shard = json.load(f)
+        label = shard["label"]
+        if owner.setdefault(label, tid) != tid:
+            raise ValueError(f"tasks {owner[label]} and {tid} share the label {label!r}")
+        merged[label] = shard["entry"]
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable OTOC parameter scan")
+    parser.add_argument("spec", help="grid spec (JSON)")
+    parser.add_argument("--shards", default="scan_shards")
+    parser.add_argument("--out", default="scan_result.json")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--kernels", default="numpy",
+                        choices=("numpy", "threads", "numba"))
+    parser.add_argument("--no-cache", action="store_true",
+                        help="bypass result_cache (always simulate)")
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+
+    t0 = time.perf_counter()
+    tasks = run_scan(spec, args.shards, args.workers, args.threads_per_worker,
+                     args.kernels, not args.no_cache)
+    merged = merge_shards(tasks, args.shards)
+    write_atomic(args.out, {"spec": spec, "exact_simulation": merged})
+    print(f"  {len(merged)} curvas → {args.out} "
+          f"({time.perf_counter() - t0:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+============================================================
+CACHÉ DE CURVAS EXACTAS C(d) — DIRECCIONADA POR CONTENIDO
+============================================================
+Proyecto Kaelion — Paper 1
+
+On-disk cache in front of the exact engine. An entry is keyed by
+the SHA-256 of (model, N, full parameter dict incl. boundary,
+seed, engine version) and stores the float64 C(d) values for
+every depth computed so far plus a provenance record. The model
+is the engine name (otoc_engine.canonical_model), so a dataset
+alias such as syk_simplified shares the entry of syk. Depths are
+kept inside the entry rather than in the key, so a lookup returns
+a partial hit and only the missing depths are simulated.
+
+Entries are .npz files written atomically. Eviction is LRU by
+file mtime (touched on every hit) down to `max_bytes`.
+
+Default location: $OTOC_CACHE_DIR or <repo>/.otoc_cache
+============================================================
+"""
+
+import hashlib
+import json
+import os
+import platform
+import time
+import zipfile
+
+import numpy as np
+
+from otoc_engine import (ENGINE_VERSION, FloquetStep, canonical_model,
+                         model_params, otoc_sweep)
+
+DEFAULT_ROOT = os.environ.get(
+    "OTOC_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 ".otoc_cache"))
+
+# Tamaño máximo por defecto (bytes)
+MAX_BYTES = 512 * 1024 ** 2
+
+
+def cache_key(model, n, params=None, seed=None, engine_version=ENGINE_VERSION):
+    """Hex SHA-256 of the canonical description of one curve."""
+    # Alias del dataset (syk_simplified) y nombre del motor comparten entrada
+    blob = json.dumps({
+        "model": canonical_model(model),
+        "n": int(n),
+        "params": model_params(model, params),
+        "seed": None if seed is None else int(seed),
+        "engine_version": engine_version,
+    }, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of exact C(d) vectors."""
+
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.npz")
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with np.load(path) as f:
+                depths = f["depths"]
+                values = f["C_d"]
+                provenance = json.loads(str(f["provenance"]))
+        except (FileNotFoundError, OSError, KeyError, ValueError,
+                zipfile.BadZipFile):
+            return None
+        os.utime(path)
+        return depths, values, provenance
+
+    def lookup(self, model, n, depths, params=None, seed=None):
+        """Cached values for `depths`: ({depth: C}, [missing depths])."""
+        entry = self._read(cache_key(model, n, params, seed))
+        known = {} if entry is None else dict(zip(entry[0].tolist(), entry[1]))
+        hits = {d: float(known[d]) for d in depths if d in known}
+        missing = [d for d in depths if d not in known]
+        return hits, missing
+
+    def store(self, model, n, values, params=None, seed=None, provenance=None):
+        """Merge {depth: C} into the entry of this curve."""
+        key = cache_key(model, n, params, seed)
+        entry = self._read(key)
+        merged = {} if entry is None else dict(zip(entry[0].tolist(), entry[1]))
+        merged.update(values)
+
+        record = {} if entry is None else entry[2]
+        record.update({
+            "model": canonical_model(model),
+            "n_qubits": int(n),
+            "parameters": model_params(model, params),
+            "seed": None if seed is None else int(seed),
+            "engine_version": ENGINE_VERSION,
+            "numpy_version": np.__version__,
+            "host": platform.node(),
+            "updated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        })
+        if provenance:
+            record.update(provenance)
+
+        depths = np.array(sorted(merged), dtype=np.int64)
+        tmp = f"{self._path(key)}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            np.savez(f, depths=depths,
+                     C_d=np.array([merged[d] for d in depths], dtype=np.float64),
+                     provenance=json.dumps(record))
+        os.replace(tmp, self._path(key))
+        self.evict(keep=self._path(key))
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until size <= max_bytes.
+
+        `keep` (a path, the entry just written) is never dropped.
+        """
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".npz"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if path == keep:
+                continue
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.root):
+            if name.endswith(".npz"):
+                os.remove(os.path.join(self.root, name))
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def cached_curve(model, n, depths, params=None, seed=None, cache=None):
+    """C(d) for `depths`, simulating only the depths not yet cached."""
+    cache = default_cache() if cache is None else cache
+    hits, missing = cache.lookup(model, n, depths, params, seed)
+    if missing:
+        t0 = time.perf_counter()
+        step = FloquetStep(model, n, params, seed)
+        new = dict(zip(missing, otoc_sweep(step, missing).tolist()))
+        cache.store(model, n, new, params, seed,
+                    {"elapsed_s": time.perf_counter() - t0})
+        hits.update(new)
+    return np.array([hits[d] for d in depths])
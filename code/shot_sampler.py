@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+============================================================
+MUESTREO POR SHOTS — SUSTITUTO LOCAL DEL SAMPLER V2
+============================================================
+Proyecto Kaelion — Paper 1
+
+Synthetic hardware data without queueing jobs. The IBM numbers
+are frequencies of the echo's success outcome over 4096 shots
+and 5 runs per (model, N, depth); here the same estimator is
+drawn from the exact probabilities:
+
+  marginal  C(d) is the success probability; counts are
+            Binomial(shots, C) for every (config, run, depth)
+            in one rng.binomial call.
+  full      small N only: the whole outcome distribution
+            |H_0 U^{-d} Z_1 U^d ψ0⟩|² is built per depth and
+            bitstring counts are one rng.multinomial call over
+            (runs, depths, 2^N); C is the all-zero fraction.
+
+Both return float64 arrays of shape (..., runs, depths), the
+layout of paper1_data.hardware(), so the analysis, bootstrap
+and Ω classifier run unchanged on shot-noised data.
+sampler_document() writes a hardware_runs JSON in the layout of
+data/paper1_recovered_ibm_data.json.
+
+Usage:
+  python code/shot_sampler.py --bench 1000000
+  python code/shot_sampler.py --out synthetic_ibm.json
+============================================================
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from otoc_engine import (DEPTHS, FloquetStep, apply_1q, apply_butterfly,
+                         initial_state, otoc_sweep)
+
+SHOTS = 4096
+RUNS = 5
+
+# N máximo para la distribución completa (2^N probabilidades por depth)
+FULL_MAX_N = 14
+
+_H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+
+
+def sample_counts(p, shots=SHOTS, runs=RUNS, rng=None):
+    """Success counts for probabilities p (..., depths): (..., runs, depths)."""
+    rng = np.random.default_rng(rng)
+    p = np.clip(np.asarray(p, dtype=np.float64), 0.0, 1.0)
+    shape = p.shape[:-1] + (runs, p.shape[-1])
+    return rng.binomial(shots, np.broadcast_to(p[..., None, :], shape))
+
+
+def sample_runs(p, shots=SHOTS, runs=RUNS, rng=None):
+    """Shot-noised C(d) estimates, float64 (..., runs, depths)."""
+    return sample_counts(p, shots, runs, rng) / shots
+
+
+def outcome_distribution(step, depths=DEPTHS):
+    """Outcome probabilities of the echo circuit, shape (depths, 2^N)."""
+    n = step.n
+    if n > FULL_MAX_N:
+        raise ValueError(f"full distribution limited to N <= {FULL_MAX_N}")
+    probs = np.empty((len(depths), 1 << n))
+    for i, d in enumerate(depths):
+        psi = initial_state(n)
+        step.forward(psi, d)
+        apply_butterfly(psi, n)
+        step.backward(psi, d)
+        apply_1q(psi, _H, 0, n)
+        probs[i] = np.abs(psi) ** 2
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+def sample_bitstrings(probs, shots=SHOTS, runs=RUNS, rng=None):
+    """Bitstring counts for (depths, 2^N) probabilities: (runs, depths, 2^N)."""
+    rng = np.random.default_rng(rng)
+    return rng.multinomial(shots, probs, size=(runs,) + probs.shape[:-1])
+
+
+def simulate_runs(model, n, depths=DEPTHS, params=None, seed=None,
+                  shots=SHOTS, runs=RUNS, rng=None, mode="marginal"):
+    """Synthetic hardware block (runs, depths) for one configuration."""
+    step = FloquetStep(model, n, params, seed)
+    if mode == "full":
+        counts = sample_bitstrings(outcome_distribution(step, depths),
+                                   shots, runs, rng)
+        return counts[..., 0] / shots
+    if mode != "marginal":
+        raise ValueError(f"unknown mode {mode!r}")
+    return sample_runs(otoc_sweep(step, depths), shots, runs, rng)
+
+
+def sampler_document(blocks, shots=SHOTS, rng=None):
+    """hardware_runs JSON for {label: (model, n, depths, exact C)}."""
+    rng = np.random.default_rng(rng)
+    hw = {}
+    for label, (model, n, depths, p) in blocks.items():
+        runs = sample_runs(p, shots, RUNS, rng)
+        hw[label] = {
+            "model": model,
+            "n_qubits": int(n),
+            "depths": [int(d) for d in depths],
+            "runs": [{"run": k + 1, "C_d": [float(c) for c in row]}
+                     for k, row in enumerate(runs)],
+        }
+    return {
+        "metadata": {"backend": "shot_sampler", "backend_qubits": None,
+                     "date": time.strftime("%Y-%m-%d"), "shots": shots,
+                     "n_points": sum(len(e["runs"]) * len(e["depths"])
+                                     for e in hw.values())},
+        "hardware_runs": hw,
+    }
+
+
+def main():
+    from otoc_analysis import C0, REGIME_EDGES, REGIMES
+    from paper1_data import depths, exact
+
+    parser = argparse.ArgumentParser(description="Local Sampler V2 stand-in")
+    parser.add_argument("--shots", type=int, default=SHOTS)
+    parser.add_argument("--bench", type=int, default=0,
+                        help="configurations for the Ω classifier benchmark")
+    parser.add_argument("--out", default=None, help="write hardware_runs JSON")
+    parser.add_argument("--rng", type=int, default=0)
+    args = parser.parse_args()
+
+    paper = {"kicked_ising_N4": ("kicked_ising", 4),
+             "kicked_ising_N8": ("kicked_ising", 8),
+             "kicked_ising_N12": ("kicked_ising", 12),
+             "kicked_ising_N20": ("kicked_ising", 20),
+             "integrable_N4": ("integrable", 4),
+             "floquet_N4": ("floquet", 4)}
+    blocks = {k: (m, n, depths(m, n), exact(m, n)) for k, (m, n) in paper.items()}
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(sampler_document(blocks, args.shots, args.rng), f, indent=2)
+        print(f"  → {args.out}")
+
+    if args.bench:
+        p = np.stack([b[3] for b in blocks.values()])
+        reps = -(-args.bench // len(p))
+        t0 = time.perf_counter()
+        runs = sample_runs(np.tile(p, (reps, 1)), args.shots, RUNS, args.rng)
+        omega = runs.mean(axis=(1, 2)) / C0
+        t1 = time.perf_counter()
+        regime = np.digitize(omega, REGIME_EDGES)
+        same = regime == np.tile(np.digitize(p.mean(axis=1) / C0, REGIME_EDGES),
+                                 reps)
+        print(f"  {len(omega)} configuraciones × {RUNS} runs × {p.shape[1]} "
+              f"depths × {args.shots} shots: {t1 - t0:.2f} s")
+        for i, label in enumerate(blocks):
+            o = omega[i::len(p)]
+            print(f"  {label:<18} Ω = {o.mean():.4f} ± {o.std(ddof=1):.4f}  "
+                  f"{REGIMES[regime[i]]:<20} estable: {same[i::len(p)].mean():.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+============================================================
+MODO ESPECTRAL — DIAGONALIZACIÓN DE U_F Y C(d) A CUALQUIER DEPTH
+============================================================
+Proyecto Kaelion — Paper 1
+
+For N ≤ 14 the Floquet operator U_F is built by running the
+engine's layers on the whole identity at once, and diagonalized
+once, U_F = V e^{iθ} V†.
+Then, with a = V†ψ0 and b = V†χ0,
+
+  ψ_d = V (e^{iθd} ⊙ a),   χ_d = V (e^{iθd} ⊙ b),
+  C(d) = |Σ_x z_1(x) χ_d(x)* ψ_d(x)|²,
+
+so any depth vector (thousands of depths, far past the d = 14
+grid, to look for Poincaré recurrences τ_P ~ 2^N) is phase-vector
+arithmetic plus two (2^N × 2^N)·(2^N × depths) products, chunked
+to MEMORY_BUDGET, with no time stepping.
+
+U_F is unitary but its eigenvalues are degenerate (lattice
+symmetries), so eig + QR per degenerate cluster left V unitary
+only to ~1e-9 at N = 12. The complex Schur form U = Z T Z† of a
+normal matrix is diagonal, and Z is unitary to machine precision
+(7.7e-14 at N = 12, off-diagonal |T| ≤ 2.5e-14), so V = Z.
+
+Eigendecompositions are cached on disk per (model, N, params,
+seed, engine version), with the keys and LRU policy of
+result_cache, under <cache root>/spectral. The default size bound
+holds two N = SPECTRAL_MAX_N entries, and the entry just written is
+never evicted (--check-cache).
+
+level_spacing_ratio() gives ⟨r⟩ = ⟨min(s_j, s_j+1)/max(s_j, s_j+1)⟩
+of the sorted quasi-energies (circular spacings), for a batch of
+parameter sets in one batched eigvals call. Spacings below
+DEGENERACY_TOL are exact symmetry degeneracies between sectors
+and are dropped (each degenerate cluster counts as one level);
+without that, Floquet N = 4–10 gave 0.32, 0.11, 0.19, 0.07, now
+0.32, 0.28, 0.37, 0.38. The spectrum still mixes symmetry
+sectors, so the value leans to Poisson (0.386);
+symmetry.sector_ratio resolves KI by momentum sector.
+============================================================
+"""
+
+import argparse
+import os
+import time
+import zipfile
+
+import numpy as np
+from scipy.linalg import schur
+
+from otoc_engine import (DEPTHS, FloquetStep, apply_layers, initial_state,
+                         readout_state, z_bits)
+from result_cache import DEFAULT_ROOT, ResultCache, cache_key
+
+SPECTRAL_MAX_N = 14
+
+# Tolerancia para agrupar cuasi-energías degeneradas
+DEGENERACY_TOL = 1e-9
+
+# Memoria por bloque de depths (bytes)
+MEMORY_BUDGET = 1 << 28
+
+SPECTRAL_ROOT = os.path.join(DEFAULT_ROOT, "spectral")
+
+
+def entry_bytes(n):
+    """Approximate .npz size of one cached spectrum (V, θ, header)."""
+    return (1 << 2 * n) * 16 + (1 << n) * 8 + 4096
+
+
+# Caben dos entradas de N = SPECTRAL_MAX_N (V sola ocupa 4 GiB a N = 14)
+SPECTRUM_MAX_BYTES = 2 * entry_bytes(SPECTRAL_MAX_N)
+
+
+def floquet_matrix(model, n, params=None, seed=None):
+    """Dense U_F, shape (2^N, 2^N)."""
+    if n > SPECTRAL_MAX_N:
+        raise ValueError(f"spectral mode limited to N <= {SPECTRAL_MAX_N}")
+    step = FloquetStep(model, n, params, seed)
+    # Cada fila es un estado de la base; apply_layers acepta lotes
+    rows = np.eye(1 << n, dtype=complex)
+    apply_layers(rows, step.layers, n)
+    return rows.T
+
+
+def eigenphases(u):
+    """Sorted quasi-energies θ in (−π, π] of a unitary (or a stack)."""
+    return np.sort(np.angle(np.linalg.eigvals(u)), axis=-1)
+
+
+def diagonalize(u):
+    """(θ, V) with U = V diag(e^{iθ}) V† and V unitary (complex Schur)."""
+    t, z = schur(u, output="complex")
+    theta = np.angle(np.diag(t))
+    order = np.argsort(theta)
+    return theta[order], z[:, order]
+
+
+class SpectrumCache(ResultCache):
+    """Eigendecompositions of U_F, same keys and LRU policy as ResultCache."""
+
+    def __init__(self, root=SPECTRAL_ROOT, max_bytes=SPECTRUM_MAX_BYTES):
+        super().__init__(root, max_bytes)
+
+    def get(self, model, n, params=None, seed=None):
+        path = self._path(cache_key(model, n, params, seed))
+        try:
+            with np.load(path) as f:
+                spectrum = f["theta"], f["vectors"]
+        except (FileNotFoundError, OSError, KeyError, ValueError,
+                zipfile.BadZipFile):
+            return None
+        os.utime(path)
+        return spectrum
+
+    def put(self, model, n, theta, vectors, params=None, seed=None):
+        path = self._path(cache_key(model, n, params, seed))
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            np.savez(f, theta=theta, vectors=vectors)
+        os.replace(tmp, path)
+        # La entrada recién escrita nunca se expulsa, aunque supere max_bytes
+        self.evict(keep=path)
+
+
+def check_cache():
+    """An N = SPECTRAL_MAX_N entry fits the default bound and survives put()."""
+    import tempfile
+
+    need = entry_bytes(SPECTRAL_MAX_N)
+    print(f"  N={SPECTRAL_MAX_N}: entrada ≈ {need / 1024 ** 3:.2f} GiB, "
+          f"límite {SPECTRUM_MAX_BYTES / 1024 ** 3:.2f} GiB")
+    assert SPECTRUM_MAX_BYTES >= 2 * need
+    # Misma situación a escala: una entrada mayor que max_bytes
+    n = 6
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SpectrumCache(tmp, max_bytes=entry_bytes(n) // 2)
+        theta, vectors = diagonalize(floquet_matrix("kicked_ising", n))
+        cache.put("kicked_ising", n, theta, vectors)
+        assert cache.get("kicked_ising", n) is not None
+        cache.put("kicked_ising", n, theta, vectors, {"J": 0.5})
+        assert cache.get("kicked_ising", n, {"J": 0.5}) is not None
+        assert cache.get("kicked_ising", n) is None
+    print("  put() conserva la entrada nueva: OK")
+
+
+def spectrum(model, n, params=None, seed=None, cache=None):
+    """(θ, V) of U_F, from the cache when available (cache=False skips it)."""
+    if cache is None:
+        cache = SpectrumCache()
+    hit = cache.get(model, n, params, seed) if cache else None
+    if hit is not None:
+        return hit
+    theta, vectors = diagonalize(floquet_matrix(model, n, params, seed))
+    if cache:
+        cache.put(model, n, theta, vectors, params, seed)
+    return theta, vectors
+
+
+def spectral_curve(theta, vectors, depths, memory_budget=MEMORY_BUDGET):
+    """C(d) for any depth vector from the eigendecomposition of U_F."""
+    dim = len(theta)
+    n = dim.bit_length() - 1
+    a = vectors.conj().T @ initial_state(n)
+    b = vectors.conj().T @ readout_state(n)
+    z1 = 1.0 - 2.0 * z_bits(n, 1)
+
+    depths = np.asarray(depths)
+    out = np.empty(len(depths))
+    chunk = max(1, memory_budget // (dim * 16 * 4))
+    for s in range(0, len(depths), chunk):
+        phase = np.exp(1j * np.outer(theta, depths[s:s + chunk]))
+        psi = vectors @ (a[:, None] * phase)
+        chi = vectors @ (b[:, None] * phase)
+        out[s:s + chunk] = np.abs((z1[:, None] * chi.conj() * psi).sum(axis=0)) ** 2
+    return out
+
+
+def level_spacing_ratio(theta, tol=DEGENERACY_TOL):
+    """
+    ⟨r⟩ of sorted quasi-energies along the last axis (circular),
+    skipping spacings ≤ tol (degenerate levels count once).
+    """
+    theta = np.sort(np.asarray(theta), axis=-1)
+    wrap = theta[..., :1] + 2 * np.pi
+    s = np.diff(np.concatenate([theta, wrap], axis=-1), axis=-1)
+    # Espaciados no degenerados primero, en su orden original
+    keep = s > tol
+    s = np.take_along_axis(s, np.argsort(~keep, axis=-1, kind="stable"), axis=-1)
+    count = keep.sum(axis=-1, keepdims=True)
+    j = np.arange(s.shape[-1])
+    valid = j < count
+    s_next = np.take_along_axis(s, (j + 1) % np.maximum(count, 1), axis=-1)
+    with np.errstate(invalid="ignore"):
+        r = np.where(valid, np.minimum(s, s_next) / np.maximum(s, s_next), np.nan)
+    return np.nanmean(r, axis=-1)
+
+
+def batch_ratio(model, n, param_sets, seed=None):
+    """⟨r⟩ for every parameter set, one batched eigvals call."""
+    stack = np.stack([floquet_matrix(model, n, p, seed) for p in param_sets])
+    return level_spacing_ratio(eigenphases(stack))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spectral C(d) at any depth")
+    parser.add_argument("--model", default="kicked_ising")
+    parser.add_argument("--n", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-depth", type=int, default=4096)
+    parser.add_argument("--top", type=int, default=5,
+                        help="largest C(d) beyond the paper grid")
+    parser.add_argument("--check-cache", action="store_true",
+                        help="check that an N = SPECTRAL_MAX_N entry survives put()")
+    args = parser.parse_args()
+
+    if args.check_cache:
+        check_cache()
+        return
+
+    t0 = time.perf_counter()
+    theta, vectors = spectrum(args.model, args.n, seed=args.seed)
+    t1 = time.perf_counter()
+    depths = np.arange(args.max_depth + 1)
+    curve = spectral_curve(theta, vectors, depths)
+    t2 = time.perf_counter()
+
+    print(f"{args.model} N={args.n}: espectro {t1 - t0:.2f} s, "
+          f"{len(depths)} depths {t2 - t1:.2f} s")
+    for d, c in zip(DEPTHS, curve[DEPTHS]):
+        print(f"  d={d:>4}  C={c:.6e}")
+    late = depths > max(DEPTHS)
+    top = np.argsort(curve[late])[::-1][:args.top]
+    print(f"  Máximos para d > {max(DEPTHS)} (recurrencias):")
+    for i in top:
+        print(f"  d={depths[late][i]:>4}  C={curve[late][i]:.6e}")
+    print(f"  ⟨r⟩ = {level_spacing_ratio(theta):.4f} "
+          f"(Poisson 0.386, COE 0.527)")
+
+
+if __name__ == "__main__":
+    main()
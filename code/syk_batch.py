@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+============================================================
+SYK POR LOTES — TODAS LAS SEMILLAS EN UN SOLO ARREGLO
+============================================================
+Proyecto Kaelion — Paper 1
+
+Evolves many disorder realizations of the syk model at once.
+For a chunk of S seeds the state tensors are (S, 2^N) arrays
+and the all-to-all ZZ step is an (S, 2^N) diagonal phase table,
+so every Floquet step is a handful of vectorized NumPy calls
+over the whole chunk. Chunks are sized from a memory budget
+(1000 seeds at N=12 need ~230 MB).
+
+Output follows the `syk_N4` block of data/paper1_raw_data.json
+(`realizations` keyed by str(seed), `disorder_average` with
+ddof=1 std).
+============================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from otoc_engine import (DEPTHS, apply_1q, dataset_model, initial_state,
+                         model_params, readout_state, rx, syk_couplings, z_bits)
+
+# Presupuesto de memoria por bloque de semillas (bytes)
+MEMORY_BUDGET = 1 << 28
+
+# Nombre del modelo en exact_simulation (y en hardware_runs)
+DATASET_MODEL = dataset_model("syk")
+
+
+def pair_products(n):
+    """Z_i Z_j (±1, float64) for every pair i < j, shape (P, 2^n)."""
+    z = [1.0 - 2.0 * z_bits(n, q) for q in range(n)]
+    return np.array([z[i] * z[j] for i in range(n) for j in range(i + 1, n)])
+
+
+def phase_table(n, seeds, coupling_range=(0.5, 1.5), zz=None):
+    """exp(-i Σ J_ij Z_i Z_j) for every seed, shape (S, 2^n)."""
+    if zz is None:
+        zz = pair_products(n)
+    couplings = np.array([syk_couplings(n, s, coupling_range) for s in seeds])
+    return np.exp(-1j * (couplings @ zz))
+
+
+def seeds_per_chunk(n, memory_budget=MEMORY_BUDGET):
+    """Seeds that fit in `memory_budget`: psi, chi, phase + float temp."""
+    per_seed = (3 * 16 + 8) * (1 << n)
+    return max(1, memory_budget // per_seed)
+
+
+def _sweep_chunk(n, seeds, depths, kick, coupling_range, zz):
+    """C(d) for one chunk of seeds, shape (S, len(depths))."""
+    phase = phase_table(n, seeds, coupling_range, zz)
+    psi = np.tile(initial_state(n), (len(seeds), 1))
+    chi = np.tile(readout_state(n), (len(seeds), 1))
+
+    values = {}
+    d = 0
+    for target in sorted(set(depths)):
+        for _ in range(target - d):
+            for state in (psi, chi):
+                for q in range(n):
+                    apply_1q(state, kick, q, n)
+                state *= phase
+        d = target
+        p = psi.reshape(len(seeds), 2, 2, -1)
+        c = chi.reshape(len(seeds), 2, 2, -1)
+        amp = (np.einsum("sar,sar->s", c[:, :, 0, :].conj(), p[:, :, 0, :])
+               - np.einsum("sar,sar->s", c[:, :, 1, :].conj(), p[:, :, 1, :]))
+        values[d] = np.abs(amp) ** 2
+    return np.stack([values[d] for d in depths], axis=1)
+
+
+def syk_batch_curves(n, seeds, depths=DEPTHS, params=None,
+                     memory_budget=MEMORY_BUDGET):
+    """C(d) for every seed, shape (len(seeds), len(depths))."""
+    p = model_params("syk", params)
+    kick = rx(2 * p["h"])
+    zz = pair_products(n)
+    chunk = seeds_per_chunk(n, memory_budget)
+    seeds = list(seeds)
+
+    out = np.empty((len(seeds), len(depths)))
+    for s in range(0, len(seeds), chunk):
+        out[s:s + chunk] = _sweep_chunk(n, seeds[s:s + chunk], depths, kick,
+                                        p["coupling_range"], zz)
+    return out
+
+
+def realizations_dict(seeds, depths, curves):
+    """`realizations` layout of the JSON: {str(seed): [{depth, C_d}]}."""
+    return {
+        str(seed): [{"depth": int(d), "C_d": float(c)}
+                    for d, c in zip(depths, row)]
+        for seed, row in zip(seeds, curves)
+    }
+
+
+def syk_block(n, seeds, depths=DEPTHS, params=None,
+              memory_budget=MEMORY_BUDGET):
+    """Full `syk_N*` entry of exact_simulation for the given seeds."""
+    p = model_params("syk", params)
+    curves = syk_batch_curves(n, seeds, depths, params, memory_budget)
+    mean = curves.mean(axis=0)
+    std = curves.std(axis=0, ddof=1) if len(seeds) > 1 else np.zeros(len(depths))
+    return {
+        "model": DATASET_MODEL,
+        "n_qubits": n,
+        "parameters": {"coupling_range": list(p["coupling_range"]),
+                       "interaction": "all-to-all ZZ",
+                       "h": p["h"]},
+        "n_realizations": len(seeds),
+        "seeds": [int(s) for s in seeds],
+        "depths": [int(d) for d in depths],
+        "C_0": 0.5,
+        "realizations": realizations_dict(seeds, depths, curves),
+        "disorder_average": {
+            "C_d_mean": [{"depth": int(d), "C_d_mean": float(m),
+                          "C_d_std": float(s)}
+                         for d, m, s in zip(depths, mean, std)],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched SYK C(d) curves")
+    parser.add_argument("--n", type=int, default=4)
+    parser.add_argument("--n-seeds", type=int, default=50)
+    parser.add_argument("--first-seed", type=int, default=1000)
+    parser.add_argument("--seed-step", type=int, default=137)
+    args = parser.parse_args()
+
+    seeds = [args.first_seed + k * args.seed_step for k in range(args.n_seeds)]
+    t0 = time.perf_counter()
+    block = syk_block(args.n, seeds)
+    elapsed = time.perf_counter() - t0
+
+    print(f"SYK N={args.n}, {len(seeds)} seeds  ({elapsed:.2f} s)")
+    for row in block["disorder_average"]["C_d_mean"]:
+        print(f"  d={row['depth']:>2}  ⟨C⟩={row['C_d_mean']:.6f}"
+              f" ± {row['C_d_std']:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+============================================================
+TIPICIDAD CUÁNTICA — OTOC A TEMPERATURA INFINITA
+============================================================
+Proyecto Kaelion — Paper 1
+
+The echo measures one product state, X_0|0…0⟩ read out along
+H_0, which is far from the β = 0 ensemble. The infinite-
+temperature OTOC
+
+  F(d) = Tr(W(d) V W(d) V) / 2^N,   W(d) = U^{-d} Z_1 U^d,
+
+with the butterfly Z_1 and a probe Pauli V on qubit 0 (Z_0 by
+default), is estimated by quantum typicality: for random states
+r_k (random-phase e^{iφ}/√2^N or Haar, normalized complex
+Gaussian), E⟨r|A|r⟩ = Tr A / 2^N, so
+
+  F(d) ≈ (1/K) Σ_k ⟨W(d) r_k| V |W(d) V r_k⟩.
+
+V r_k and r_k are carried forward together as one (2K, 2^N)
+batch across the depth grid; at each depth a copy gets Z_1 and
+d backward steps, and the K values are row-wise ⟨δ|V|γ⟩. The
+statistical error is the scatter over k, σ/√K, and shrinks as
+2^{-N/2}/√K (states are processed `batch` at a time to bound
+memory). trace_otoc() is the exact trace from the dense U_F of
+spectral.py, for checks at N ≤ 10.
+============================================================
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from otoc_engine import DEPTHS, FloquetStep, apply_butterfly, apply_probe
+
+PROBES = ("z", "x")
+
+ENSEMBLES = ("phase", "haar")
+
+# Estados aleatorios por lote (memoria: 4·batch vectores de 2^N)
+TYPICALITY_BATCH = 4
+
+
+def random_states(n, k, rng, ensemble="phase"):
+    """K normalized random states, shape (K, 2^N)."""
+    dim = 1 << n
+    if ensemble == "phase":
+        return np.exp(2j * np.pi * rng.random((k, dim))) / np.sqrt(dim)
+    if ensemble == "haar":
+        psi = rng.normal(size=(k, dim)) + 1j * rng.normal(size=(k, dim))
+        return psi / np.linalg.norm(psi, axis=-1, keepdims=True)
+    raise ValueError(f"ensemble must be one of {ENSEMBLES}")
+
+
+def apply_probe_pauli(psi, n, probe="z"):
+    """V = Z_0 or X_0 (otoc_engine.apply_probe) on a batch, in place."""
+    if probe == "x":
+        return apply_probe(psi, n)
+    if probe != "z":
+        raise ValueError(f"probe must be one of {PROBES}")
+    psi.reshape(-1, 2, 1 << (n - 1))[:, 1, :] *= -1
+    return psi
+
+
+def typical_otoc(model, n, depths=DEPTHS, k=8, params=None, seed=None,
+                 probe="z", ensemble="phase", rng=None, batch=TYPICALITY_BATCH):
+    """
+    Typicality estimate of F(d): dict with the per-state values
+    (K, depths), their mean and the standard error of the mean.
+    """
+    rng = np.random.default_rng(rng)
+    step = FloquetStep(model, n, params, seed)
+    depths = list(depths)
+    values = np.empty((k, len(depths)))
+
+    for s in range(0, k, batch):
+        b = min(batch, k - s)
+        r = random_states(n, b, rng, ensemble)
+        # Filas [0, b): V r; filas [b, 2b): r
+        states = np.concatenate([apply_probe_pauli(r.copy(), n, probe), r])
+        d = 0
+        for target in sorted(set(depths)):
+            step.forward(states, target - d)
+            d = target
+            t = states.copy()
+            apply_butterfly(t, n)
+            step.backward(t, d)
+            gamma = apply_probe_pauli(t[:b], n, probe)
+            f = np.sum(t[b:].conj() * gamma, axis=-1).real
+            for col, dd in enumerate(depths):
+                if dd == d:
+                    values[s:s + b, col] = f
+
+    mean = values.mean(axis=0)
+    sem = values.std(axis=0, ddof=1) / np.sqrt(k) if k > 1 else np.full_like(mean, np.nan)
+    return {"values": values, "mean": mean, "sem": sem}
+
+
+def trace_otoc(model, n, depths=DEPTHS, params=None, seed=None, probe="z"):
+    """Exact Tr(W(d) V W(d) V) / 2^N from the dense U_F (small N)."""
+    from spectral import floquet_matrix
+
+    u = floquet_matrix(model, n, params, seed)
+    dim = 1 << n
+    eye = np.eye(dim, dtype=complex)
+    w = eye.copy()
+    apply_butterfly(w, n)
+    v = apply_probe_pauli(eye.copy(), n, probe)
+    out = []
+    for d in depths:
+        ud = np.linalg.matrix_power(u, d)
+        wd = ud.conj().T @ w @ ud
+        out.append(np.trace(wd @ v @ wd @ v).real / dim)
+    return np.array(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Infinite-temperature OTOC")
+    parser.add_argument("--model", default="kicked_ising")
+    parser.add_argument("--n", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--k", type=int, default=8, help="random states")
+    parser.add_argument("--probe", default="z", choices=PROBES)
+    parser.add_argument("--ensemble", default="phase", choices=ENSEMBLES)
+    parser.add_argument("--check", type=int, default=0,
+                        help="compare with the exact trace at this N")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    est = typical_otoc(args.model, args.n, k=args.k, seed=args.seed,
+                       probe=args.probe, ensemble=args.ensemble, rng=0)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{args.model} N={args.n}, K={args.k} ({args.ensemble}), "
+          f"V = {args.probe.upper()}_0  ({elapsed:.2f} s)")
+    print(f"  2^(-N/2)/√K = {2 ** (-args.n / 2) / np.sqrt(args.k):.1e}")
+    for d, f, e in zip(DEPTHS, est["mean"], est["sem"]):
+        print(f"  d={d:>2}  F={f:+.5f} ± {e:.5f}")
+
+    if args.check:
+        exact = trace_otoc(args.model, args.check, seed=args.seed,
+                           probe=args.probe)
+        small = typical_otoc(args.model, args.check, k=args.k, seed=args.seed,
+                             probe=args.probe, ensemble=args.ensemble, rng=0)
+        # σ = 0 en profundidades donde todo estado aleatorio da F exacto
+        z = np.abs(small["mean"] - exact) / np.maximum(small["sem"], 1e-12)
+        print(f"  N={args.check}: max |F_típ − F_traza| = "
+              f"{np.abs(small['mean'] - exact).max():.1e}, "
+              f"max z = {z.max():.2f}")
+
+
+if __name__ == "__main__":
+    main()